@@ -0,0 +1,299 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# requires-python = ">=3.12"
+# dependencies = []
+# ///
+"""
+Build All Graphics
+
+Single entry point for every generated graphic. The scripts are declared as
+targets with their inputs, outputs and the targets they depend on:
+
+    releases         release_timeline/fetch_release_data.py -> build/releases.txt
+    releases-dark    release_timeline/generate_plots.py (needs releases)
+    releases-light   release_timeline/generate_plots.py --light (needs releases)
+    team             team_timeline/team_timeline.py
+
+A target is rebuilt only when stale: an output is missing, or its
+arguments, the content of an input (its sources and the outputs of the
+targets it depends on) or the content of an output differ from its last
+successful build. Each build is recorded in build/targets/<target>.json with
+the SHA-256 of its inputs and outputs, so outputs written by other runs (e.g.
+a --since window or --watch previews) are rebuilt, and a rebuilt
+dependency with unchanged output does not cascade. A releases.txt fetched
+before it had a build record is adopted (recorded as it is) instead of
+fetched again. Targets whose dependencies
+are done run in parallel worker processes, so a full refresh takes about as
+long as the slowest chain of targets. Each target's output is printed when it
+finishes, followed by a per-target timing summary.
+
+Usage:
+    ./build.py [TARGET ...] [--jobs N] [--force] [--refresh] [--fetch-args ARGS] [--runner CMD]
+
+Options:
+    TARGET        Targets to build, with the targets they depend on (default: all)
+    --jobs        Targets run at the same time (default: one per CPU)
+    --force       Rebuild the named targets (not their dependencies) even when up to date
+    --refresh     Fetch new releases (fetch_release_data.py --incremental) even if releases.txt exists
+    --fetch-args  Extra arguments for fetch_release_data.py, e.g. "--assets --backend http"
+    --runner      Command running the scripts (default: "uv run")
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+RELEASE_DIR = ROOT / "release_timeline"
+TEAM_DIR = ROOT / "team_timeline"
+RECORD_DIR = ROOT / "build" / "targets"
+
+sys.path.insert(0, str(RELEASE_DIR))
+from build_cache import SOURCES  # noqa: E402
+
+# The plotting code: fetch scripts and tools do not change the plots
+RELEASE_SOURCES = [RELEASE_DIR / source for source in SOURCES]
+
+# Target -> script, its arguments, the targets it depends on, its inputs and
+# outputs (files), and whether existing outputs without a build record are
+# adopted instead of rebuilt, in dependency order
+TARGETS = {
+    "releases": {
+        "script": RELEASE_DIR / "fetch_release_data.py",
+        "args": [],
+        "deps": [],
+        "inputs": [],
+        "outputs": [RELEASE_DIR / "build" / "releases.txt"],
+        "adopt": True,  # A full fetch is slow and the data only grows
+    },
+    "releases-dark": {
+        "script": RELEASE_DIR / "generate_plots.py",
+        "args": [],
+        "deps": ["releases"],
+        "inputs": RELEASE_SOURCES,
+        "outputs": [
+            RELEASE_DIR / "build" / "eest_releases_timeline_dark.png",
+            RELEASE_DIR / "build" / "eest_releases_timeline_dark_hires.png",
+        ],
+        "adopt": False,
+    },
+    "releases-light": {
+        "script": RELEASE_DIR / "generate_plots.py",
+        "args": ["--light"],
+        "deps": ["releases"],
+        "inputs": RELEASE_SOURCES,
+        "outputs": [
+            RELEASE_DIR / "build" / "eest_releases_timeline_light.png",
+            RELEASE_DIR / "build" / "eest_releases_timeline_light_hires.png",
+        ],
+        "adopt": False,
+    },
+    "team": {
+        "script": TEAM_DIR / "team_timeline.py",
+        "args": [],
+        "deps": [],
+        "inputs": [TEAM_DIR / "team_timeline.py"],
+        "outputs": [TEAM_DIR / "build" / "team_timeline.png"],
+        "adopt": False,
+    },
+}
+
+
+def select_targets(names):
+    """Return the named targets and every target they depend on, in dependency order."""
+    selected = set()
+
+    def visit(name):
+        if name not in selected:
+            selected.add(name)
+            for dep in TARGETS[name]["deps"]:
+                visit(dep)
+
+    for name in names:
+        visit(name)
+    return [name for name in TARGETS if name in selected]
+
+
+def file_sha256(path):
+    """Hash a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def target_inputs(name):
+    """Return the input files of a target: its sources and the outputs of the targets it depends on."""
+    target = TARGETS[name]
+    return target["inputs"] + [output for dep in target["deps"] for output in TARGETS[dep]["outputs"]]
+
+
+def file_hashes(paths):
+    """Map each existing file (relative to ROOT) to its SHA-256."""
+    return {str(path.relative_to(ROOT)): file_sha256(path) for path in paths if path.exists()}
+
+
+def record_file(name):
+    """Return the file recording the last successful build of a target."""
+    return RECORD_DIR / f"{name}.json"
+
+
+def stale_reason(name, args=(), force=False):
+    """Return why a target must be rebuilt with args (extra arguments), or None if it is up to date."""
+    target = TARGETS[name]
+    if force:
+        return "forced"
+    missing = [output for output in target["outputs"] if not output.exists()]
+    if missing:
+        return f"{missing[0].name} missing"
+    try:
+        record = json.loads(record_file(name).read_text())
+    except (OSError, ValueError):
+        return "no build record"
+    if record.get("args") != [*target["args"], *args]:
+        return "arguments changed"
+    for kind, paths in (("inputs", target_inputs(name)), ("outputs", target["outputs"])):
+        hashes, recorded = file_hashes(paths), record.get(kind, {})
+        changed = [path for path in hashes.keys() | recorded.keys() if hashes.get(path) != recorded.get(path)]
+        if changed:
+            return f"{Path(min(changed)).name} changed"
+    return None
+
+
+def record_build(name, args=()):
+    """Atomically record the arguments, inputs and outputs of a successful build."""
+    target = TARGETS[name]
+    record = {
+        "args": [*target["args"], *args],
+        "inputs": file_hashes(target_inputs(name)),
+        "outputs": file_hashes(target["outputs"]),
+    }
+    RECORD_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = record_file(name).with_suffix(f".json.{os.getpid()}.tmp")
+    tmp_file.write_text(json.dumps(record, indent=2) + "\n")
+    tmp_file.replace(record_file(name))
+
+
+def run_target(name, runner, extra_args=()):
+    """Run a target's script; returns (returncode, output, seconds)."""
+    target = TARGETS[name]
+    command = [*runner, str(target["script"]), *target["args"], *extra_args]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return result.returncode, result.stdout, time.perf_counter() - start
+
+
+def build(names, jobs=None, force=False, refresh=False, fetch_args=(), runner=("uv", "run")):
+    """Build the selected targets (and their dependencies) in parallel; returns {target: (status, seconds)}.
+
+    force only applies to the targets in names, not to their dependencies.
+    """
+    pending = select_targets(names)
+    results = {}
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        running = {}
+        while pending or running:
+            for name in list(pending):
+                deps = TARGETS[name]["deps"]
+                if any(results.get(dep, ("",))[0] in ("failed", "skipped") for dep in deps):
+                    pending.remove(name)
+                    results[name] = ("skipped", 0.0)
+                    continue
+                if not all(dep in results for dep in deps):
+                    continue
+                pending.remove(name)
+                args = list(fetch_args) if name == "releases" else []
+                reason = stale_reason(name, args, force and name in names)
+                status = "up to date"
+                if reason == "no build record" and TARGETS[name]["adopt"]:
+                    record_build(name, args)  # Take the outputs as they are
+                    reason, status = None, "adopted"
+                extra_args = args
+                if name == "releases" and refresh and reason is None:
+                    reason, extra_args = "refresh", ["--incremental", *args]
+                if reason is None:
+                    results[name] = (status, 0.0)
+                    print(f"[{name}] {status}")
+                    continue
+                print(f"[{name}] building ({reason})...")
+                running[pool.submit(run_target, name, runner, extra_args)] = name, args
+            if not running:
+                continue  # Targets were resolved without running; look at the next ones
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, args = running.pop(future)
+                returncode, output, seconds = future.result()
+                for line in output.splitlines():
+                    print(f"[{name}] {line}")
+                if returncode == 0:
+                    record_build(name, args)
+                    results[name] = ("built", seconds)
+                    print(f"[{name}] built in {seconds:.1f}s")
+                else:
+                    results[name] = ("failed", seconds)
+                    print(f"[{name}] failed with exit code {returncode} after {seconds:.1f}s")
+    return results
+
+
+def critical_path(results):
+    """Return the chain of targets with the longest total run time and that time."""
+    paths = {}
+    for name in TARGETS:
+        if name not in results:
+            continue
+        deps = [paths[dep] for dep in TARGETS[name]["deps"] if dep in paths]
+        chain, seconds = max(deps, key=lambda path: path[1], default=([], 0.0))
+        paths[name] = (chain + [name], seconds + results[name][1])
+    return max(paths.values(), key=lambda path: path[1], default=([], 0.0))
+
+
+def print_summary(results, wall_seconds):
+    """Print the status and run time of each target."""
+    print()
+    print("=== Build Summary ===")
+    width = max(len(name) for name in results)
+    for name, (status, seconds) in results.items():
+        print(f"  {name:<{width}}  {status:<10}  {seconds:6.1f}s")
+    chain, chain_seconds = critical_path(results)
+    work = sum(seconds for _, seconds in results.values())
+    print(f"Wall time: {wall_seconds:.1f}s ({work:.1f}s of target run time)")
+    if chain_seconds:
+        print(f"Critical path: {' -> '.join(chain)} ({chain_seconds:.1f}s)")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Build all STEEL graphics")
+    parser.add_argument("targets", nargs="*", metavar="TARGET", help=f"Targets to build: {', '.join(TARGETS)}")
+    parser.add_argument("--jobs", type=int, help="Targets run at the same time (default: one per CPU)")
+    parser.add_argument(
+        "--force", action="store_true", help="Rebuild the named targets (not their dependencies) even when up to date"
+    )
+    parser.add_argument("--refresh", action="store_true", help="Fetch new releases even if releases.txt exists")
+    parser.add_argument("--fetch-args", default="", help="Extra arguments for fetch_release_data.py")
+    parser.add_argument("--runner", default="uv run", help='Command running the scripts (default: "uv run")')
+    args = parser.parse_args()
+    unknown = [name for name in args.targets if name not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target {unknown[0]!r} (choose from {', '.join(TARGETS)})")
+
+    print("=== STEEL Graphics Build ===")
+    start = time.perf_counter()
+    results = build(
+        args.targets or list(TARGETS), args.jobs, args.force, args.refresh,
+        shlex.split(args.fetch_args), shlex.split(args.runner),
+    )
+    print_summary(results, time.perf_counter() - start)
+    if any(status in ("failed", "skipped") for status, _ in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# requires-python = ">=3.12"
+# dependencies = []
+# ///
+"""
+Import Time Report
+
+Runs build targets (see build.py) the way a build does, with Python's
+import profiler enabled (PYTHONPROFILEIMPORTTIME, like python -X importtime),
+and reports how much of each run went into importing modules: the total,
+and the heaviest top-level imports. Heavy libraries are imported lazily by
+the scripts (e.g. matplotlib only when a plot is rendered, not when it is up
+to date), so run it both with fresh and with up-to-date outputs.
+
+Usage:
+    ./import_report.py [TARGET ...] [--top N] [--budget MS] [--runner CMD]
+
+Options:
+    TARGET     Targets to run (default: every plot target)
+    --top      Heaviest imports listed per target (default: 8)
+    --budget   Exit with an error if a target spends more than MS milliseconds importing
+    --runner   Command running the scripts (default: "uv run")
+"""
+
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+from build import ROOT, TARGETS
+
+PLOT_TARGETS = [name for name in TARGETS if name != "releases"]  # The fetch needs the network
+
+
+def parse_import_times(log):
+    """Return {module: cumulative microseconds} of the top-level imports in an importtime log."""
+    imports = {}
+    for line in log.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        if len(name) - len(name.lstrip()) == 1:  # Nested imports are indented further
+            imports[name.strip()] = imports.get(name.strip(), 0) + int(cumulative)
+    return imports
+
+
+def profile_target(name, runner):
+    """Run a target with import profiling; returns (returncode, {module: microseconds}, wall seconds)."""
+    target = TARGETS[name]
+    command = [*runner, str(target["script"]), *target["args"]]
+    env = dict(os.environ, PYTHONPROFILEIMPORTTIME="1")
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return result.returncode, parse_import_times(result.stderr), time.perf_counter() - start
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Report the import time of the graphics scripts")
+    parser.add_argument("targets", nargs="*", metavar="TARGET", help=f"Targets to run: {', '.join(TARGETS)}")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports listed per target (default: 8)")
+    parser.add_argument("--budget", type=float, metavar="MS", help="Maximum import time per target in milliseconds")
+    parser.add_argument("--runner", default="uv run", help='Command running the scripts (default: "uv run")')
+    args = parser.parse_args()
+    unknown = [name for name in args.targets if name not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target {unknown[0]!r} (choose from {', '.join(TARGETS)})")
+
+    over_budget = []
+    for name in args.targets or PLOT_TARGETS:
+        returncode, imports, seconds = profile_target(name, shlex.split(args.runner))
+        total_ms = sum(imports.values()) / 1000
+        print(f"=== {name}: {total_ms:.0f} ms importing of {seconds * 1000:.0f} ms total ===")
+        if returncode != 0:
+            print(f"  (exited with code {returncode})")
+        for module, microseconds in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {microseconds / 1000:8.1f} ms  {module}")
+        if args.budget is not None and total_ms > args.budget:
+            over_budget.append(name)
+        print()
+
+    if over_budget:
+        print(f"Import time over the {args.budget:.0f} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Build Cache
+
+Skips re-rendering plots whose inputs did not change. A render is keyed by
+the SHA-256 of everything its files depend on: the plotted data (only the
+columns the plot reads), the theme, the outputs requested and the plotting
+code (sources and matplotlib/Pillow versions). After rendering, a manifest
+build/cache/renders/<key>.json lists the files written with their content
+hashes; a later run with the same key whose files are all still in place is
+a hit and renders nothing.
+
+Outputs are written atomically (see figure_export.py) with deterministic
+metadata, so the same key always leaves the same bytes behind.
+
+Hashing the plotted data takes parsing it. So a run also records, in
+build/cache/data/<key>.json, what it derived from its input files: the
+digest of each plot's data and the summary figures. That record is keyed by
+the input files' hashes and the run's options. A run whose outputs are all
+up to date then parses nothing.
+"""
+
+import hashlib
+import json
+import os
+from functools import cache
+from pathlib import Path
+
+from release_data import file_sha256
+
+CACHE_VERSION = 1  # Bump when the key or manifest format changes
+SCRIPT_DIR = Path(__file__).parent
+SOURCES = [
+    "generate_plots.py", "figure_export.py", "label_placement.py", "decimation.py", "build_cache.py",
+    "release_data.py", "release_store.py", "release_db.py",  # The data layer, for the data records
+]
+
+
+@cache
+def code_digest():
+    """Hash the plotting sources and the versions of the libraries drawing and encoding the plots.
+
+    Versions come from the package metadata, so checking the cache does not
+    import matplotlib.
+    """
+    from importlib.metadata import version
+
+    digest = hashlib.sha256(f"{CACHE_VERSION}|{version('matplotlib')}|{version('pillow')}".encode())
+    for source in SOURCES:
+        digest.update((SCRIPT_DIR / source).read_bytes())
+    return digest.hexdigest()
+
+
+def table_digest(table, columns):
+    """Hash some columns of a release table (names, types and values).
+
+    Strings are hashed by value, so the width of their NumPy unicode dtype
+    (the longest string of the column) does not matter.
+    """
+    import numpy as np
+
+    digest = hashlib.sha256()
+    for name in columns:
+        column = np.asarray(table[name])
+        if column.dtype.kind == "U":
+            digest.update(f"{name}|str|".encode())
+            digest.update(json.dumps(column.tolist()).encode())
+        else:
+            digest.update(f"{name}|{column.dtype.str}|".encode())
+            digest.update(np.ascontiguousarray(column).tobytes())
+    return digest.hexdigest()
+
+
+def render_key(*parts):
+    """Hash the inputs of a render (JSON-serializable parts) together with the plotting code."""
+    payload = json.dumps([code_digest(), *parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def manifest_file(build_dir, key, kind="renders"):
+    """Return the manifest file of the render (or, with kind="data", the data record) with the given key."""
+    return Path(build_dir) / "cache" / kind / f"{key}.json"
+
+
+def write_manifest(manifest, content):
+    """Atomically write a manifest (JSON-serializable content)."""
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = manifest.with_name(f"{manifest.name}.{os.getpid()}.tmp")  # Workers may write the same manifest
+    tmp_file.write_text(json.dumps(content, indent=2) + "\n")
+    tmp_file.replace(manifest)
+
+
+def cached_outputs(build_dir, key):
+    """Return the files of a render if all are still as written, otherwise None."""
+    try:
+        outputs = json.loads(manifest_file(build_dir, key).read_text())["outputs"]
+    except (OSError, ValueError, KeyError):
+        return None
+    files = [Path(build_dir) / name for name in outputs]
+    try:
+        if all(file_sha256(output_file) == sha256 for output_file, sha256 in zip(files, outputs.values())):
+            return files
+    except OSError:
+        pass
+    return None
+
+
+def record_outputs(build_dir, key, files):
+    """Atomically write the manifest of a render that wrote files (all inside build_dir)."""
+    build_dir = Path(build_dir)
+    outputs = {str(Path(output_file).relative_to(build_dir)): file_sha256(output_file) for output_file in files}
+    write_manifest(manifest_file(build_dir, key), {"outputs": outputs})
+
+
+def cached_data(build_dir, key):
+    """Return the data record with the given key, or None if there is none."""
+    try:
+        return json.loads(manifest_file(build_dir, key, "data").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def record_data(build_dir, key, record):
+    """Atomically write the data record (JSON-serializable) of a run's input files."""
+    write_manifest(manifest_file(build_dir, key, "data"), record)
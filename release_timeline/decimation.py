@@ -0,0 +1,43 @@
+"""
+Series Decimation
+
+Thins out dense line series before plotting with min/max bucketing per pixel
+column (M4, Jugel et al. 2014): of all points falling into the same column of
+the output raster, only the first, the last, the lowest and the highest are
+kept. A line through the kept points covers the same pixels as the line
+through all of them, so a series draws like the original with at most four
+points per column, however long its history.
+
+Points that must stay (e.g. labelled ones) are kept on top of that.
+"""
+
+import numpy as np
+
+
+def run_extreme(values, runs, starts, reduce):
+    """Return the index of the first extreme (reduce: np.minimum or np.maximum) of each run."""
+    extremes = reduce.reduceat(values, starts)
+    hits = np.flatnonzero(values == extremes[runs])
+    return hits[np.unique(runs[hits], return_index=True)[1]]
+
+
+def decimate(x, y, keep=()):
+    """Return the sorted indices of the points of (x, y) to draw.
+
+    x is in output pixels (pixel columns are [k, k + 1)) and must be
+    increasing. Every index in keep is included as well.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if len(x) == 0:
+        return np.arange(0)
+    columns = np.floor(x)
+    starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+    ends = np.r_[starts[1:], len(x)] - 1
+    runs = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(x)]))
+    return np.unique(np.concatenate([
+        starts,
+        ends,
+        run_extreme(y, runs, starts, np.minimum),
+        run_extreme(y, runs, starts, np.maximum),
+        np.asarray(keep, dtype=np.int64),
+    ]))
@@ -12,66 +12,526 @@ for use by the visualization script. This separation allows you to fetch data
 once and generate plots multiple times without hitting GitHub API rate limits.
 
 Usage:
-    ./fetch_releases.py
+    ./fetch_releases.py [--incremental] [--repo OWNER/NAME] [--backend gh|http] [--graphql] [--db] [--assets]
+    ./fetch_releases.py --org ORG [--jobs N] [--backend gh|http] [--graphql] [--db]
+
+    Any mode also takes --record DIR or --replay DIR in place of --backend.
+
+Options:
+    --incremental    Only fetch releases newer than those already in releases.txt
+                     and merge them into the existing file
+    --repo           Repository to fetch releases from (default: ethereum/execution-spec-tests)
+    --org            Crawl the releases of every repository in an organization
+    --jobs           Number of repositories (--org) or asset requests (--assets)
+                     fetched concurrently (default: 8)
+    --backend        How to talk to the GitHub API (default: gh):
+                       gh    run the gh CLI for each request
+                       http  pooled keep-alive HTTPS connections, token taken
+                             from GITHUB_TOKEN or GH_TOKEN
+    --record         Fetch with the http backend and save every response (with its
+                     pagination links) into a cassette directory
+    --replay         Serve all requests from a cassette directory instead of GitHub,
+                     e.g. for offline, repeatable benchmarks
+    --graphql        Use the GraphQL API, requesting only the tag, date and name of
+                     100 releases per request (output is identical to REST)
+    --db             Upsert releases into the SQLite index releases.sqlite (see
+                     release_db.py); releases.txt is then exported from it
+    --assets         Also harvest the name, size and download count of the assets
+                     of every fetched release from the same REST release pages
+                     (--jobs concurrent extra requests for truncated asset lists);
+                     with --incremental only new releases are harvested and merged
+                     into assets.txt. Not supported with --graphql
 
 Requirements:
-    - gh CLI tool installed and authenticated
+    - gh CLI tool installed and authenticated (set GH_CLI to use another command,
+      e.g. a local stub), or a GitHub token for the http backend (set
+      GITHUB_API_URL to use another API server, e.g. mock_github_api.py)
 
 Output:
     - releases.txt: Raw release data
+    - releases.cols/: Columnar, memory-mappable copy of releases.txt (see release_store.py)
     - releases_chronological.md: Human-readable chronological list
+    - releases.sqlite: Release index of all fetched repositories (--db)
+    - assets.txt: Release asset sizes and download counts (--assets)
+    - org/<org>/<repo>.txt: Raw release data per repository (--org mode)
 """
 
+import argparse
+import asyncio
+import hashlib
+import http.client
+import io
+import os
+import re
+import shlex
 import subprocess
 import sys
 import json
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-def fetch_release_data():
-    """Fetch release data from GitHub API using gh CLI."""
-    print("Fetching release data from GitHub...")
+import release_db
+from release_data import parse_release_lines
+from release_store import write_release_store
+
+REPO = "ethereum/execution-spec-tests"
+PER_PAGE = 100  # Maximum page size accepted by the GitHub releases API
+# Releases listing this many embedded assets may have been truncated, so their
+# assets are fetched from the release's own (paginated) assets endpoint
+ASSETS_EMBED_LIMIT = 100
+GH_CLI = os.environ.get("GH_CLI", "gh")
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
+# Only the fields we keep, newest first like the REST releases endpoint
+RELEASES_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    releases(first: 100, after: $cursor, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { tagName publishedAt name }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(Exception):
+    """The GraphQL API answered with errors."""
+
+
+# Errors raised by the fetch backends when a request fails
+FETCH_ERRORS = (subprocess.CalledProcessError, http.client.HTTPException, OSError, GraphQLError)
+
+
+def gh_command(*args):
+    """Build a gh CLI command line."""
+    return [*shlex.split(GH_CLI), *args]
+
+
+def release_to_line(release):
+    """Convert a GitHub API release object to our format: tag|date|name."""
+    tag = release['tag_name']
+    date = release['published_at']
+    name = release['name'] or tag
+    return f"{tag}|{date}|{name}"
+
+def iter_json_array_items(stream, chunk_size=1 << 16):
+    """Yield the items of the JSON array(s) read from stream, one at a time.
+
+    gh --paginate either merges the page arrays into one or prints them back to
+    back ("[...][...]"); both are handled, and only the item currently being
+    decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    in_array = False
+    eof = False
     
-    try:
-        # Fetch releases using gh CLI
-        result = subprocess.run([
-            "gh", "api", "repos/ethereum/execution-spec-tests/releases", "--paginate"
-        ], capture_output=True, text=True, check=True)
+    while True:
+        # Skip whitespace between values and commas between array items
+        while pos < len(buf) and (buf[pos].isspace() or (in_array and buf[pos] == ",")):
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                break
+            buf, pos = stream.read(chunk_size), 0
+            eof = not buf
+            continue
+        
+        if not in_array:
+            if buf[pos] != "[":
+                raise json.JSONDecodeError("Expecting '['", buf, pos)
+            in_array = True
+            pos += 1
+        elif buf[pos] == "]":
+            in_array = False
+            pos += 1
+        else:
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Item is split across reads: read at least as much again and retry
+                chunk = stream.read(max(chunk_size, len(buf) - pos))
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield item
+    
+    if in_array:
+        raise json.JSONDecodeError("Unterminated array", buf, pos)
+
+class GhBackend:
+    """Fetch GitHub API resources by running the gh CLI for each request."""
+    
+    name = "gh"
+    hint = "Make sure 'gh' CLI is installed and authenticated"
+    
+    def get_json(self, path):
+        """Fetch a single API resource (None if the response is empty)."""
+        result = subprocess.run(gh_command("api", path), capture_output=True, text=True, check=True)
+        return json.loads(result.stdout) if result.stdout.strip() else None
+    
+    def get_json_status(self, path):
+        """Fetch a single API resource; returns the HTTP status and the data (None if empty)."""
+        result = subprocess.run(gh_command("api", path, "--include"), capture_output=True, text=True, check=True)
+        # --include prints the status line and headers, a blank line, then the body
+        head, body = re.split(r"\r?\n\r?\n", result.stdout, maxsplit=1) if result.stdout.strip() else ("", "")
+        status = int(head.split(maxsplit=2)[1])
+        return status, json.loads(body) if body.strip() else None
+    
+    def iter_items(self, path):
+        """Stream the items of a paginated API list, following all pages."""
+        with subprocess.Popen(gh_command("api", path, "--paginate"), stdout=subprocess.PIPE, text=True) as proc:
+            yield from iter_json_array_items(proc.stdout)
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    
+    def graphql(self, query, variables):
+        """Run a GraphQL query and return its data."""
+        args = ["api", "graphql", "-f", f"query={query}"]
+        for key, value in variables.items():
+            if value is not None:
+                args += ["-f", f"{key}={value}"]
+        result = subprocess.run(gh_command(*args), capture_output=True, text=True, check=True)
+        return graphql_data(json.loads(result.stdout))
+
+class HttpBackend:
+    """Fetch GitHub API resources over pooled keep-alive HTTP(S) connections.
+
+    Each thread keeps one persistent connection to the API server, so a fetch
+    of many pages or repositories pays for process startup, authentication and
+    the TLS handshake only once per thread.
+    """
+    
+    name = "http"
+    hint = "Make sure GITHUB_TOKEN (or GH_TOKEN) is set to a valid token"
+    
+    def __init__(self, api_url=GITHUB_API_URL, token=None):
+        self.api_url = urllib.parse.urlsplit(api_url)
+        self.token = token or os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+        self._local = threading.local()
+    
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.api_url.scheme == "https":
+                conn = http.client.HTTPSConnection(self.api_url.netloc, timeout=60)
+            else:
+                conn = http.client.HTTPConnection(self.api_url.netloc, timeout=60)
+            self._local.conn = conn
+        return conn
+    
+    def target(self, path):
+        """Return the request target of path.
+
+        path is relative to the API root or an absolute URL on the API server
+        (as found in pagination links).
+        """
+        if "://" in path:
+            url = urllib.parse.urlsplit(path)
+            return urllib.parse.urlunsplit(("", "", url.path, url.query, ""))
+        return f"{self.api_url.path.rstrip('/')}/{path.lstrip('/')}"
+    
+    def request(self, method, path, body=None):
+        """Send a request and return the response, ready to be read."""
+        target = self.target(path)
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "steel-graphics",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if body is not None:
+            headers["Content-Type"] = "application/json"
         
-        releases = json.loads(result.stdout)
-        print(f"Fetched {len(releases)} releases from GitHub")
+        # A kept-alive connection may have been closed by the server while
+        # idle; reconnect once before giving up.
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                response = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
         
-        # Convert to our format: tag|date|name
-        release_lines = []
-        for release in releases:
-            tag = release['tag_name']
-            date = release['published_at']
-            name = release['name'] or tag
-            release_lines.append(f"{tag}|{date}|{name}")
+        if response.status >= 400:
+            response.read()
+            raise http.client.HTTPException(f"{method} {target}: HTTP {response.status} {response.reason}")
+        return response
+    
+    def get_json(self, path):
+        """Fetch a single API resource (None if the response is empty)."""
+        return self.get_json_status(path)[1]
+    
+    def get_json_status(self, path):
+        """Fetch a single API resource; returns the HTTP status and the data (None if empty)."""
+        response = self.request("GET", path)
+        body = response.read()
+        return response.status, json.loads(body) if body.strip() else None
+    
+    def iter_items(self, path):
+        """Stream the items of a paginated API list, following all pages."""
+        while path:
+            response = self.request("GET", path)
+            yield from iter_json_array_items(io.TextIOWrapper(response, encoding="utf-8"))
+            response.read()  # Drain the response so the connection can be reused
+            path = next_page_link(response.getheader("Link"))
+    
+    def graphql(self, query, variables):
+        """Run a GraphQL query and return its data."""
+        body = json.dumps({"query": query, "variables": variables})
+        response = self.request("POST", "graphql", body=body)
+        return graphql_data(json.loads(response.read()))
+
+def cassette_key(method, target, body=None):
+    """Name the cassette entry of a request."""
+    return hashlib.sha256(f"{method} {target}\n{body or ''}".encode()).hexdigest()[:24]
+
+def save_cassette_entry(cassette_dir, entry):
+    """Atomically save a recorded request and response into cassette_dir."""
+    request = entry["request"]
+    entry_file = Path(cassette_dir) / f"{cassette_key(request['method'], request['target'], request['body'])}.json"
+    tmp_file = entry_file.with_suffix(".json.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(entry, f)
+    tmp_file.replace(entry_file)
+
+class CassetteResponse(io.BytesIO):
+    """A recorded response, read like an http.client.HTTPResponse."""
+    
+    def __init__(self, entry):
+        super().__init__(entry["body"].encode())
+        self.status = entry["status"]
+        self.reason = entry["reason"]
+        self.headers = entry["headers"]
+    
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+    
+    def read(self, size=-1):
+        # Like HTTPResponse, a closed response reads as empty
+        return b"" if self.closed else super().read(size)
+
+class RecordingBackend(HttpBackend):
+    """HTTP backend that also saves every response into a cassette directory.
+
+    Each request is stored as one JSON file holding the request, the status,
+    the pagination Link header and the raw body, so ReplayBackend can serve
+    the same fetch offline.
+    """
+    
+    name = "record"
+    
+    def __init__(self, cassette_dir, api_url=GITHUB_API_URL, token=None):
+        super().__init__(api_url, token)
+        self.cassette_dir = Path(cassette_dir)
+        self.cassette_dir.mkdir(parents=True, exist_ok=True)
+    
+    def request(self, method, path, body=None):
+        response = super().request(method, path, body)
+        link = response.getheader("Link")
+        entry = {
+            "request": {"method": method, "target": self.target(path), "body": body},
+            "status": response.status,
+            "reason": response.reason,
+            "headers": {"Link": link} if link else {},
+            "body": response.read().decode(),
+        }
+        save_cassette_entry(self.cassette_dir, entry)
+        return CassetteResponse(entry)
+
+class ReplayBackend(HttpBackend):
+    """Serve API requests from a cassette directory written by RecordingBackend."""
+    
+    name = "replay"
+    hint = "Make sure the cassette was recorded (--record) with the same options"
+    
+    def __init__(self, cassette_dir, api_url=GITHUB_API_URL):
+        super().__init__(api_url)
+        self.cassette_dir = Path(cassette_dir)
+    
+    def request(self, method, path, body=None):
+        target = self.target(path)
+        entry_file = self.cassette_dir / f"{cassette_key(method, target, body)}.json"
+        if not entry_file.exists():
+            raise http.client.HTTPException(f"{method} {target}: not recorded in {self.cassette_dir}")
+        with open(entry_file, "r") as f:
+            return CassetteResponse(json.load(f))
+
+def next_page_link(link_header):
+    """Return the rel="next" URL of a GitHub Link header, if any."""
+    match = re.search(r'<([^>]+)>;\s*rel="next"', link_header or "")
+    return match.group(1) if match else None
+
+def graphql_data(response):
+    """Return the data of a GraphQL response, raising on errors."""
+    if response.get("errors"):
+        raise GraphQLError("; ".join(error["message"] for error in response["errors"]))
+    return response["data"]
+
+def iter_graphql_release_pages(backend, repo=REPO):
+    """Yield pages of up to 100 releases (newest first) from the GraphQL API.
+
+    Releases are returned in the shape of the REST API objects, restricted to
+    the fields we keep, so both APIs produce identical rows.
+    """
+    owner, name = repo.split("/")
+    cursor = None
+    while True:
+        data = backend.graphql(RELEASES_QUERY, {"owner": owner, "name": name, "cursor": cursor})
+        releases = data["repository"]["releases"]
+        yield [
+            {"tag_name": node["tagName"], "published_at": node["publishedAt"], "name": node["name"]}
+            for node in releases["nodes"]
+        ]
+        if not releases["pageInfo"]["hasNextPage"]:
+            break
+        cursor = releases["pageInfo"]["endCursor"]
+
+def iter_releases(backend, repo=REPO, graphql=False):
+    """Yield all releases of repo, newest first, from the REST or GraphQL API."""
+    if graphql:
+        for page in iter_graphql_release_pages(backend, repo):
+            yield from page
+    else:
+        yield from backend.iter_items(f"repos/{repo}/releases?per_page={PER_PAGE}")
+
+BACKENDS = {"gh": GhBackend, "http": HttpBackend}
+
+def fetch_release_data(backend, repo=REPO, graphql=False, assets=None):
+    """Fetch release data from GitHub API.
+
+    The API response is decoded as a stream and each release is reduced to its
+    tag|date|name line as it arrives, so memory use does not grow with the
+    number of releases. Each release is also passed to the AssetHarvester
+    assets, if given.
+    """
+    api = "GraphQL" if graphql else "REST"
+    print(f"Fetching release data from GitHub ({backend.name} backend, {api} API)...")
+    
+    count = 0
+    try:
+        for release in iter_releases(backend, repo, graphql):
+            count += 1
+            if assets is not None:
+                assets.add(release)
+            yield release_to_line(release)
         
-        return release_lines
+        print(f"Fetched {count} releases from GitHub")
         
-    except subprocess.CalledProcessError as e:
+    except FETCH_ERRORS as e:
         print(f"Error fetching releases: {e}")
-        print("Make sure 'gh' CLI is installed and authenticated")
+        print(backend.hint)
         sys.exit(1)
     except json.JSONDecodeError as e:
         print(f"Error parsing GitHub API response: {e}")
         sys.exit(1)
 
-def save_release_data(release_lines):
-    """Save release data to file."""
-    # Create build directory if it doesn't exist
-    script_dir = Path(__file__).parent
-    build_dir = script_dir / "build"
-    build_dir.mkdir(exist_ok=True)
+def iter_release_pages(backend, repo=REPO, graphql=False):
+    """Yield pages of releases (newest first), one request per page."""
+    try:
+        if graphql:
+            yield from iter_graphql_release_pages(backend, repo)
+            return
+        page = 1
+        while True:
+            releases = backend.get_json(f"repos/{repo}/releases?per_page={PER_PAGE}&page={page}")
+            yield releases
+            if len(releases) < PER_PAGE:
+                break
+            page += 1
+    except FETCH_ERRORS as e:
+        print(f"Error fetching releases: {e}")
+        print(backend.hint)
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error parsing GitHub API response: {e}")
+        sys.exit(1)
+
+def fetch_new_release_data(backend, known_lines, repo=REPO, graphql=False, assets=None):
+    """Fetch only releases newer than the ones in known_lines.
+
+    Pages are requested newest-first and paging stops at the first page that
+    reaches an already-known release, which is usually the first one. The new
+    releases are also passed to the AssetHarvester assets, if given.
+    """
+    known = list(parse_release_lines(known_lines))
+    known_tags = {tag for tag, _, _ in known}
+    newest = max(date for _, date, _ in known)
+    
+    print(f"Fetching releases published after {newest:%Y-%m-%d %H:%M:%S} from GitHub...")
     
-    releases_file = build_dir / "releases.txt"
-    with open(releases_file, "w") as f:
+    new_lines = []
+    pages = 0
+    for releases in iter_release_pages(backend, repo, graphql):
+        pages += 1
+        # Drafts have no publish date; they are neither saved nor a sign of known data
+        published = [release for release in releases if release['published_at']]
+        fresh = [release for release in published if release['tag_name'] not in known_tags]
+        new_lines.extend(release_to_line(release) for release in fresh)
+        if assets is not None:
+            for release in fresh:
+                assets.add(release)
+        
+        # Pages are ordered newest-first, so once a page reaches a release we
+        # already have (known tag or published no later than our newest one),
+        # every following page is known as well.
+        caught_up = len(fresh) < len(published) or not all(
+            datetime.fromisoformat(release['published_at'].replace("Z", "+00:00")) > newest
+            for release in fresh
+        )
+        if caught_up:
+            break
+    
+    print(f"Fetched {len(new_lines)} new releases from GitHub ({pages} page(s) requested)")
+    return new_lines
+
+def merge_release_data(new_lines, known_lines):
+    """Merge newly fetched releases in front of the known ones (newest first)."""
+    new_tags = {line.split("|")[0] for line in new_lines}
+    return new_lines + [line for line in known_lines if line.split("|")[0] not in new_tags]
+
+def load_release_data():
+    """Load previously saved release data, if any."""
+    releases_file = Path(__file__).parent / "build" / "releases.txt"
+    if not releases_file.exists():
+        return []
+    with open(releases_file, "r") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+def save_release_data(release_lines, releases_file=None):
+    """Save release data to file (build/releases.txt unless given).
+
+    release_lines may be any iterable; lines are written as they are produced
+    and the file is only replaced once all of them have been written.
+    """
+    if releases_file is None:
+        # Create build directory if it doesn't exist
+        script_dir = Path(__file__).parent
+        build_dir = script_dir / "build"
+        build_dir.mkdir(exist_ok=True)
+        releases_file = build_dir / "releases.txt"
+    
+    tmp_file = releases_file.with_suffix(".txt.tmp")
+    count = 0
+    with open(tmp_file, "w") as f:
         for line in release_lines:
             f.write(line + "\n")
+            count += 1
+    tmp_file.replace(releases_file)
     
-    print(f"Saved {len(release_lines)} releases to {releases_file}")
+    print(f"Saved {count} releases to {releases_file}")
     return releases_file
 
 def generate_chronological_markdown(release_lines):
@@ -79,19 +539,7 @@ def generate_chronological_markdown(release_lines):
     print("Generating chronological markdown file...")
     
     # Parse and sort releases chronologically
-    releases = []
-    for line in release_lines:
-        parts = line.strip().split("|")
-        if len(parts) >= 3:
-            tag = parts[0]
-            date_str = parts[1]
-            name = parts[2]
-            # Parse date for sorting
-            date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            releases.append((date, tag, name))
-    
-    # Sort by date
-    releases.sort(key=lambda x: x[0])
+    releases = sorted(parse_release_lines(release_lines), key=lambda release: release[1])
     
     # Generate markdown
     md_content = ["# EEST Releases - Chronological Order", ""]
@@ -99,7 +547,7 @@ def generate_chronological_markdown(release_lines):
     md_content.append(f"Total releases: {len(releases)}")
     md_content.append("")
     
-    for date, tag, name in releases:
+    for tag, date, name in releases:
         date_str = date.strftime("%Y-%m-%d")
         md_content.append(f"- **{tag}** - {date_str}")
     
@@ -114,26 +562,290 @@ def generate_chronological_markdown(release_lines):
     print(f"Saved chronological release list to {md_file}")
     return md_file
 
+def asset_to_line(release, asset):
+    """Convert a release asset to our format: tag|date|name|size|download_count."""
+    return f"{release['tag_name']}|{release['published_at']}|{asset['name']}|{asset['size']}|{asset['download_count']}"
+
+class AssetHarvester:
+    """Collect the assets of the releases passed to add, as the release pages arrive.
+
+    Assets embedded in a release are used as they are. Releases whose embedded
+    list may be truncated are handed to a pool of jobs workers that page
+    through their assets endpoint while the listing continues, so extra
+    requests never run one after another.
+    """
+    
+    def __init__(self, backend, repo=REPO, jobs=8):
+        self.backend = backend
+        self.repo = repo
+        self.pool = ThreadPoolExecutor(max_workers=jobs)
+        self.asset_lines = []
+        self.extra = []
+    
+    def add(self, release):
+        """Harvest the assets of a REST API release object."""
+        # Keep only what we need, not the whole release object
+        release = {key: release.get(key) for key in ("id", "tag_name", "published_at", "assets")}
+        assets = release.pop("assets")
+        if assets is None or len(assets) >= ASSETS_EMBED_LIMIT:
+            self.extra.append(self.pool.submit(self.fetch_release_assets, release))
+        else:
+            self.asset_lines.extend(asset_to_line(release, asset) for asset in assets)
+    
+    def fetch_release_assets(self, release):
+        path = f"repos/{self.repo}/releases/{release['id']}/assets?per_page={PER_PAGE}"
+        return [asset_to_line(release, asset) for asset in self.backend.iter_items(path)]
+    
+    def finish(self):
+        """Wait for the extra requests; returns the asset lines of all added releases."""
+        try:
+            for future in self.extra:
+                self.asset_lines.extend(future.result())
+        except FETCH_ERRORS as e:
+            print(f"Error fetching release assets: {e}")
+            print(self.backend.hint)
+            sys.exit(1)
+        except json.JSONDecodeError as e:
+            print(f"Error parsing GitHub API response: {e}")
+            sys.exit(1)
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+        
+        print(f"Harvested {len(self.asset_lines)} assets ({len(self.extra)} release(s) needed extra requests)")
+        return self.asset_lines
+
+def merge_asset_data(new_lines, known_lines):
+    """Merge the assets of newly fetched releases in front of the known ones."""
+    new_tags = {line.split("|")[0] for line in new_lines}
+    return new_lines + [line for line in known_lines if line.split("|")[0] not in new_tags]
+
+def load_asset_data():
+    """Load previously saved asset data (None if there is none)."""
+    assets_file = Path(__file__).parent / "build" / "assets.txt"
+    if not assets_file.exists():
+        return None
+    with open(assets_file, "r") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+def save_asset_data(asset_lines):
+    """Save release asset data to build/assets.txt."""
+    assets_file = Path(__file__).parent / "build" / "assets.txt"
+    tmp_file = assets_file.with_suffix(".txt.tmp")
+    with open(tmp_file, "w") as f:
+        for line in asset_lines:
+            f.write(line + "\n")
+    tmp_file.replace(assets_file)
+    
+    print(f"Saved {len(asset_lines)} assets to {assets_file}")
+    return assets_file
+
+def list_org_repos(backend, org):
+    """List the full names of all repositories in a GitHub organization."""
+    print(f"Listing repositories of {org}...")
+    try:
+        repos = [repo['full_name'] for repo in backend.iter_items(f"orgs/{org}/repos?per_page={PER_PAGE}")]
+    except FETCH_ERRORS as e:
+        print(f"Error listing repositories: {e}")
+        print(backend.hint)
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error parsing GitHub API response: {e}")
+        sys.exit(1)
+    
+    print(f"Found {len(repos)} repositories")
+    return sorted(repos)
+
+def load_checkpoint(checkpoint_file):
+    """Load the repositories already crawled by an interrupted run."""
+    if not checkpoint_file.exists():
+        return {}
+    with open(checkpoint_file, "r") as f:
+        return json.load(f)["done"]
+
+def save_checkpoint(checkpoint_file, done):
+    """Atomically record the repositories crawled so far."""
+    tmp_file = checkpoint_file.with_suffix(".json.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump({"done": done}, f, indent=2, sort_keys=True)
+    tmp_file.replace(checkpoint_file)
+
+def save_repo_releases(backend, repo, org_dir, graphql=False):
+    """Fetch one repository's releases and save them, returning the count."""
+    releases_file = org_dir / f"{repo.split('/')[1]}.txt"
+    tmp_file = releases_file.with_suffix(".txt.tmp")
+    count = 0
+    with open(tmp_file, "w") as out:
+        for release in iter_releases(backend, repo, graphql):
+            out.write(release_to_line(release) + "\n")
+            count += 1
+    tmp_file.replace(releases_file)
+    return count
+
+async def crawl_org_releases(backend, org, jobs, graphql=False, db=None):
+    """Fetch the releases of every repository in org with at most jobs in flight.
+
+    A checkpoint is written after each repository, so an interrupted crawl
+    resumes with the repositories that are still missing. The checkpoint is
+    removed once the crawl completes. Each repository's releases are also
+    upserted into the db connection, if given.
+    """
+    script_dir = Path(__file__).parent
+    org_dir = script_dir / "build" / "org" / org
+    org_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_file = org_dir / "checkpoint.json"
+    
+    repos = list_org_repos(backend, org)
+    done = load_checkpoint(checkpoint_file)
+    pending = [repo for repo in repos if repo not in done]
+    if done:
+        print(f"Resuming from checkpoint: {len(done)} done, {len(pending)} remaining")
+    
+    # Fetches block on the backend, so they run on a bounded worker pool while
+    # the event loop collects results and checkpoints as each one finishes.
+    loop = asyncio.get_running_loop()
+    
+    async def crawl(repo, pool):
+        try:
+            return repo, await loop.run_in_executor(pool, save_repo_releases, backend, repo, org_dir, graphql)
+        except FETCH_ERRORS + (json.JSONDecodeError,) as e:
+            return repo, e
+    
+    failed = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for next_done in asyncio.as_completed([crawl(repo, pool) for repo in pending]):
+            repo, result = await next_done
+            if isinstance(result, Exception):
+                print(f"  {repo}: error: {result}")
+                failed.append(repo)
+                continue
+            if db is not None:
+                with open(org_dir / f"{repo.split('/')[1]}.txt", "r") as f:
+                    release_db.upsert_releases(db, repo, f)
+            done[repo] = result
+            save_checkpoint(checkpoint_file, done)
+            print(f"  {repo}: {result} releases ({len(done)}/{len(repos)})")
+    
+    if not failed:
+        checkpoint_file.unlink(missing_ok=True)
+    return org_dir, done, failed
+
 def main():
     """Main execution function."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Fetch EEST Release Data from GitHub")
+    parser.add_argument(
+        "--incremental", action="store_true", help="Only fetch releases newer than those in releases.txt"
+    )
+    parser.add_argument("--repo", default=REPO, help=f"Repository to fetch releases from (default: {REPO})")
+    parser.add_argument("--org", help="Crawl the releases of every repository in this organization")
+    parser.add_argument(
+        "--jobs", type=int, default=8,
+        help="Number of repositories (--org) or asset requests (--assets) fetched concurrently",
+    )
+    parser.add_argument(
+        "--backend", choices=sorted(BACKENDS), default="gh", help="How to talk to the GitHub API (default: gh)"
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record", type=Path, metavar="DIR", help="Save all API responses into a cassette directory"
+    )
+    cassette.add_argument(
+        "--replay", type=Path, metavar="DIR", help="Serve all API requests from a cassette directory"
+    )
+    parser.add_argument(
+        "--graphql", action="store_true", help="Fetch only tag, date and name via the GraphQL API"
+    )
+    parser.add_argument(
+        "--db", action="store_true", help="Upsert releases into the SQLite index build/releases.sqlite"
+    )
+    parser.add_argument(
+        "--assets", action="store_true", help="Also harvest release asset sizes and download counts"
+    )
+    args = parser.parse_args()
+    if args.assets and args.org:
+        parser.error("--assets is only supported for a single repository")
+    if args.assets and args.graphql:
+        parser.error("--assets harvests the assets from the REST release pages and cannot be used with --graphql")
+    if args.record:
+        backend = RecordingBackend(args.record)
+    elif args.replay:
+        backend = ReplayBackend(args.replay)
+    else:
+        backend = BACKENDS[args.backend]()
+    db = release_db.connect() if args.db else None
+    
+    if args.org:
+        print("=== Organization Release Crawler ===")
+        print()
+        org_dir, done, failed = asyncio.run(crawl_org_releases(backend, args.org, args.jobs, args.graphql, db))
+        
+        print()
+        print("=== Crawl Complete ===" if not failed else "=== Crawl Incomplete ===")
+        print(f"Release data written to: {org_dir}")
+        if db is not None:
+            print(f"Release index updated: {release_db.default_db_file()}")
+        print(f"Repositories crawled: {len(done)}")
+        print(f"Total releases fetched: {sum(done.values())}")
+        if failed:
+            print(f"Failed repositories ({len(failed)}), re-run to retry: {', '.join(failed)}")
+            sys.exit(1)
+        return
+    
     print("=== EEST Release Data Fetcher ===")
     print()
     
-    # Step 1: Fetch release data from GitHub
-    release_lines = fetch_release_data()
+    # Step 1: Fetch release data from GitHub, harvesting the assets of the
+    # fetched releases from the same pages with --assets
+    assets = AssetHarvester(backend, args.repo, args.jobs) if args.assets else None
+    known_assets = load_asset_data() if args.assets else None
+    if args.incremental:
+        known_lines = release_db.export_release_lines(db, args.repo) if db is not None else load_release_data()
+        if not known_lines:
+            print("No existing release data found, fetching full history")
+        elif args.assets and known_assets is None:
+            print("No existing asset data found, fetching full history")
+            known_lines = []
+    else:
+        known_lines = []
+    if known_lines:
+        new_lines = fetch_new_release_data(backend, known_lines, args.repo, args.graphql, assets)
+        release_lines = merge_release_data(new_lines, known_lines)
+    else:
+        release_lines = fetch_release_data(backend, args.repo, args.graphql, assets)
+    
+    # With --db, upsert into the index and export this repository's releases
+    if db is not None:
+        count = release_db.upsert_releases(db, args.repo, release_lines)
+        print(f"Upserted {count} releases into {release_db.default_db_file()}")
+        release_lines = release_db.export_release_lines(db, args.repo)
     
-    # Step 2: Save raw release data
+    # Step 2: Save raw release data, plus its columnar copy for the plot stage
     releases_file = save_release_data(release_lines)
+    store_dir = write_release_store(releases_file)
+    release_lines = load_release_data()
     
     # Step 3: Generate chronological markdown for human review
     md_file = generate_chronological_markdown(release_lines)
     
+    # Step 4: Save the harvested release assets (optional)
+    assets_file = None
+    if assets is not None:
+        asset_lines = assets.finish()
+        if known_lines:
+            asset_lines = merge_asset_data(asset_lines, known_assets)
+        assets_file = save_asset_data(asset_lines)
+    
     # Summary
     print()
     print("=== Fetch Complete ===")
     print(f"Files created:")
     print(f"  - {releases_file}")
+    print(f"  - {store_dir}/")
     print(f"  - {md_file}")
+    if db is not None:
+        print(f"  - {release_db.default_db_file()}")
+    if assets_file is not None:
+        print(f"  - {assets_file}")
     print()
     print(f"Total releases fetched: {len(release_lines)}")
     print("Data ready for visualization generation!")
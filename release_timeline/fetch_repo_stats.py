@@ -0,0 +1,190 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# requires-python = ">=3.12"
+# dependencies = []
+# ///
+"""
+Fetch Repository Activity Statistics from GitHub
+
+This script fetches weekly commit and contributor activity of one or more
+repositories from GitHub's /stats/* endpoints and saves it locally for
+activity plots next to the release timeline.
+
+GitHub computes these statistics on demand and answers 202 Accepted (with an
+empty or no body) until they are ready. All requests are queued at once and the
+pending ones are polled with exponential backoff on an asyncio event loop, so
+a repository waiting for its statistics never blocks the others and the total
+time is set by the slowest endpoint rather than by the sum of all of them.
+
+Usage:
+    ./fetch_repo_stats.py [--repo OWNER/NAME ...] [--stats NAME ...] [--jobs N] [--backend gh|http] [--timeout SECONDS]
+    ./fetch_repo_stats.py --org ORG [--stats NAME ...] [--jobs N] [--backend gh|http] [--timeout SECONDS]
+
+Options:
+    --repo       Repository to fetch statistics of, may be repeated
+                 (default: ethereum/execution-spec-tests)
+    --org        Fetch the statistics of every repository in an organization
+    --stats      Statistics to fetch, may be repeated (default: all):
+                   commit_activity  weekly commit count
+                   code_frequency   weekly additions and deletions
+                   contributors     weekly commits, additions and deletions per author
+    --jobs       Number of requests in flight at once (default: 8)
+    --backend    How to talk to the GitHub API (default: gh, see fetch_release_data.py)
+    --timeout    Give up on statistics still being computed after this many
+                 seconds (default: 120)
+
+Output (one line per week, oldest first):
+    - stats/<owner>/<repo>/commit_activity.txt: week|commits
+    - stats/<owner>/<repo>/code_frequency.txt: week|additions|deletions
+    - stats/<owner>/<repo>/contributors.txt: week|author|commits|additions|deletions
+"""
+
+import argparse
+import asyncio
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fetch_release_data import BACKENDS, FETCH_ERRORS, REPO, list_org_repos
+
+INITIAL_POLL_DELAY = 1.0  # Seconds before the first re-poll of a pending endpoint
+MAX_POLL_DELAY = 16.0
+
+def format_week(timestamp):
+    """Format the Unix timestamp of a week's start as YYYY-MM-DD."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+
+def commit_activity_lines(data):
+    """Convert /stats/commit_activity into week|commits lines."""
+    return [f"{format_week(week['week'])}|{week['total']}" for week in data]
+
+def code_frequency_lines(data):
+    """Convert /stats/code_frequency into week|additions|deletions lines."""
+    # Deletions are reported as negative numbers
+    return [f"{format_week(week)}|{additions}|{-deletions}" for week, additions, deletions in data]
+
+def contributors_lines(data):
+    """Convert /stats/contributors into week|author|commits|additions|deletions lines.
+
+    Weeks without any activity of an author are left out.
+    """
+    rows = []
+    for contributor in data:
+        author = (contributor.get("author") or {}).get("login", "ghost")
+        for week in contributor["weeks"]:
+            if week["c"] or week["a"] or week["d"]:
+                rows.append((week["w"], author, week["c"], week["a"], week["d"]))
+    rows.sort()
+    return [f"{format_week(week)}|{author}|{c}|{a}|{d}" for week, author, c, a, d in rows]
+
+STATS = {
+    "commit_activity": commit_activity_lines,
+    "code_frequency": code_frequency_lines,
+    "contributors": contributors_lines,
+}
+
+async def poll_stats(backend, pool, repo, stat, timeout):
+    """Fetch one statistics endpoint, re-polling with backoff while it is pending.
+
+    Returns the data and the number of requests made. Waiting happens on the
+    event loop, so a pending endpoint does not hold a worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    path = f"repos/{repo}/stats/{stat}"
+    deadline = loop.time() + timeout
+    delay = INITIAL_POLL_DELAY
+    polls = 0
+    while True:
+        status, data = await loop.run_in_executor(pool, backend.get_json_status, path)
+        polls += 1
+        if status != 202:  # 202 Accepted: still being computed, whatever the body
+            return data or [], polls  # 204 No Content: empty repository
+        if loop.time() + delay > deadline:
+            raise TimeoutError(f"{path} still being computed after {polls} requests")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MAX_POLL_DELAY)
+
+def save_stats(stats_dir, repo, stat, lines):
+    """Save one repository's weekly series to build/stats/<owner>/<repo>/<stat>.txt."""
+    repo_dir = stats_dir / repo
+    repo_dir.mkdir(parents=True, exist_ok=True)
+    stats_file = repo_dir / f"{stat}.txt"
+    tmp_file = stats_file.with_suffix(".txt.tmp")
+    with open(tmp_file, "w") as f:
+        for line in lines:
+            f.write(line + "\n")
+    tmp_file.replace(stats_file)
+    return stats_file
+
+async def fetch_repo_stats(backend, repos, stats, jobs, timeout):
+    """Fetch every statistic of every repository with at most jobs requests in flight.
+
+    Returns the files written and the failed (repo, stat) pairs.
+    """
+    stats_dir = Path(__file__).parent / "build" / "stats"
+
+    async def fetch(repo, stat, pool):
+        try:
+            data, polls = await poll_stats(backend, pool, repo, stat, timeout)
+            return repo, stat, save_stats(stats_dir, repo, stat, STATS[stat](data)), polls
+        except FETCH_ERRORS + (json.JSONDecodeError,) as e:
+            return repo, stat, e, None
+
+    files, failed = [], []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        requests = [fetch(repo, stat, pool) for repo in repos for stat in stats]
+        print(f"Queued {len(requests)} statistics requests...")
+        for next_done in asyncio.as_completed(requests):
+            repo, stat, result, polls = await next_done
+            if isinstance(result, Exception):
+                print(f"  {repo} {stat}: error: {result}")
+                failed.append((repo, stat))
+                continue
+            files.append(result)
+            print(f"  {repo} {stat}: saved after {polls} request(s)")
+    return files, failed
+
+def main():
+    """Main execution function."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Fetch repository activity statistics from GitHub")
+    parser.add_argument(
+        "--repo", action="append", help=f"Repository to fetch statistics of, may be repeated (default: {REPO})"
+    )
+    parser.add_argument("--org", help="Fetch the statistics of every repository in this organization")
+    parser.add_argument(
+        "--stats", action="append", choices=sorted(STATS), help="Statistics to fetch, may be repeated (default: all)"
+    )
+    parser.add_argument("--jobs", type=int, default=8, help="Number of requests in flight at once (default: 8)")
+    parser.add_argument(
+        "--backend", choices=sorted(BACKENDS), default="gh", help="How to talk to the GitHub API (default: gh)"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=120, help="Seconds to wait for statistics being computed (default: 120)"
+    )
+    args = parser.parse_args()
+    if args.repo and args.org:
+        parser.error("--repo and --org are mutually exclusive")
+    backend = BACKENDS[args.backend]()
+
+    print("=== Repository Activity Statistics Fetcher ===")
+    print()
+
+    repos = list_org_repos(backend, args.org) if args.org else args.repo or [REPO]
+    stats = args.stats or list(STATS)
+    files, failed = asyncio.run(fetch_repo_stats(backend, repos, stats, args.jobs, args.timeout))
+
+    # Summary
+    print()
+    print("=== Fetch Complete ===" if not failed else "=== Fetch Incomplete ===")
+    print(f"Statistics written to: {Path(__file__).parent / 'build' / 'stats'}")
+    print(f"Files created: {len(files)}")
+    if failed:
+        print(f"Failed ({len(failed)}), re-run to retry: {', '.join(f'{repo} {stat}' for repo, stat in failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
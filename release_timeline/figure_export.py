@@ -0,0 +1,152 @@
+"""
+Figure Export
+
+Writes one figure at several resolutions and in several formats from a single
+draw. savefig re-runs the whole Agg draw (every line, marker, annotation and
+legend) for each file, so a standard and a high resolution PNG cost two full
+renders. Here the figure is drawn once at the highest requested dpi and
+cropped to its tight bounding box (like bbox_inches="tight"). Lower
+resolutions are box-filtered (area-averaged) downsamples of that raster, and
+the PNG files are encoded on a thread pool while vector formats (SVG, PDF) are
+written from the same figure with the already computed bounding box.
+
+Files are written atomically (to a temporary file, then renamed) and with
+deterministic metadata: no creation dates and stable SVG ids, so the same
+figure always gives the same bytes and readers never see a partial file.
+png_bytes encodes a figure in memory instead, e.g. to serve it.
+
+matplotlib, NumPy and Pillow are only imported when exporting.
+"""
+
+import io
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from pathlib import Path
+
+VECTOR_FORMATS = ("svg", "pdf")
+PNG_SOFTWARE = "Matplotlib version{version}, https://matplotlib.org/"  # As savefig writes it
+VECTOR_METADATA = {"svg": {"Date": None}, "pdf": {"CreationDate": None}}  # No timestamps
+SVG_HASHSALT = "figure_export"  # Seeds SVG element ids, which are random otherwise
+
+
+def temporary_file(output_file):
+    """Return the temporary file an output is written to before being renamed into place."""
+    output_file = Path(output_file)
+    return output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+
+
+def render_tight(fig, dpi, facecolor, step=1):
+    """Draw fig once at dpi and crop the raster to its padded tight bounding box.
+
+    The crop is aligned to multiples of step pixels, so the raster downsamples
+    by any divisor of step without partial blocks; area outside the figure is
+    filled with facecolor. Returns the RGBA array and the bounding box in
+    inches.
+    """
+    import matplotlib
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import to_rgba
+
+    figure_dpi = fig.get_dpi()
+    fig.set_dpi(dpi)
+    fig.patch.set_facecolor(facecolor)
+    fig.patch.set_edgecolor("none")
+    canvas = FigureCanvasAgg(fig)
+    try:
+        canvas.draw()
+        raster = np.asarray(canvas.buffer_rgba()).copy()
+        bbox = fig.get_tightbbox(canvas.get_renderer()).padded(matplotlib.rcParams["savefig.pad_inches"])
+    finally:
+        fig.set_dpi(figure_dpi)  # Leave the figure as it was, e.g. for re-theming and another export
+
+    # Raster rows run top to bottom, figure coordinates bottom to top
+    height, width = raster.shape[:2]
+    left = math.floor(bbox.x0 * dpi / step) * step
+    right = math.ceil(bbox.x1 * dpi / step) * step
+    top = math.floor((height - bbox.y1 * dpi) / step) * step
+    bottom = math.ceil((height - bbox.y0 * dpi) / step) * step
+    image = np.empty((bottom - top, right - left, 4), dtype=np.uint8)
+    image[...] = np.round(np.array(to_rgba(facecolor)) * 255).astype(np.uint8)
+    rows = slice(max(top, 0), min(bottom, height))
+    cols = slice(max(left, 0), min(right, width))
+    image[rows.start - top:rows.stop - top, cols.start - left:cols.stop - left] = raster[rows, cols]
+    return image, bbox
+
+
+def downsample(image, ratio):
+    """Area-average an RGBA image down by ratio (rendered dpi / target dpi)."""
+    from PIL import Image
+
+    if ratio == 1:
+        return image
+    if float(ratio).is_integer():
+        return image.reduce(int(ratio))  # Mean of each ratio x ratio block
+    size = (max(1, round(image.width / ratio)), max(1, round(image.height / ratio)))
+    return image.resize(size, Image.Resampling.BOX)
+
+
+def encode_png(image, file, dpi):
+    """Encode an image as PNG with savefig's metadata into a file name or binary file object."""
+    import matplotlib
+    from PIL import PngImagePlugin
+
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Software", PNG_SOFTWARE.format(version=matplotlib.__version__))
+    image.save(file, format="png", dpi=(dpi, dpi), pnginfo=info)
+
+
+def save_png(image, output_file, dpi, ratio=1):
+    """Downsample an RGBA image by ratio and encode it as PNG with savefig's metadata."""
+    tmp_file = temporary_file(output_file)
+    encode_png(downsample(image, ratio), tmp_file, dpi)
+    tmp_file.replace(output_file)
+    return output_file
+
+
+def png_bytes(fig, dpi, facecolor):
+    """Draw fig once at dpi, cropped like the saved files, and return the encoded PNG."""
+    from PIL import Image
+
+    raster, _ = render_tight(fig, dpi, facecolor)
+    buffer = io.BytesIO()
+    encode_png(Image.fromarray(raster), buffer, dpi)
+    return buffer.getvalue()
+
+
+def export_figure(fig, outputs, facecolor, jobs=None):
+    """Write fig to every output file from a single draw; returns the files written.
+
+    outputs maps each file to its dpi (PNG) or to None for vector formats
+    (format from the suffix, see VECTOR_FORMATS).
+    """
+    import matplotlib
+    from PIL import Image
+
+    rasters = {output_file: dpi for output_file, dpi in outputs.items() if dpi is not None}
+    vectors = [output_file for output_file, dpi in outputs.items() if dpi is None]
+    bbox = None
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        encoded = []
+        if rasters:
+            top_dpi = max(rasters.values())
+            ratios = [top_dpi / dpi for dpi in rasters.values()]
+            step = reduce(math.lcm, (int(ratio) for ratio in ratios if ratio.is_integer()), 1)
+            raster, bbox = render_tight(fig, top_dpi, facecolor, step)
+            image = Image.fromarray(raster)
+            for (output_file, dpi), ratio in zip(rasters.items(), ratios):
+                encoded.append(pool.submit(save_png, image, output_file, dpi, ratio))
+        # Vector backends draw the figure themselves; matplotlib is not thread-safe,
+        # so they run here while the PNGs are encoded
+        for output_file in vectors:
+            fmt = Path(output_file).suffix[1:]
+            tmp_file = temporary_file(output_file)
+            with matplotlib.rc_context({"svg.hashsalt": SVG_HASHSALT}):
+                fig.savefig(
+                    tmp_file, format=fmt, facecolor=facecolor, edgecolor="none", bbox_inches=bbox or "tight",
+                    metadata=VECTOR_METADATA[fmt],
+                )
+            tmp_file.replace(output_file)
+        return [future.result() for future in encoded] + vectors
@@ -4,8 +4,9 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "matplotlib>=3.8.0",
-#     "pandas>=2.1.0", 
-#     "numpy>=1.24.0"
+#     "numpy>=1.24.0",
+#     "pyarrow>=14.0.0",
+#     "pillow>=9.1.0"
 # ]
 # ///
 """
@@ -15,71 +16,117 @@ This script generates release timeline plots from previously fetched data.
 Run fetch_release_data.py first to get the latest data from GitHub.
 
 Usage:
-    ./generate_plots.py [--light]
+    ./generate_plots.py [--light] [--since YYYY-MM-DD] [--until YYYY-MM-DD] [--db [--repo OWNER/NAME]] [--assets] [--vector svg|pdf ...]
+    ./generate_plots.py --matrix THEME[:OUTPUT,...] ... [--jobs N] [--since ...] [--until ...] [--db ...] [--assets]
 
 Options:
     --light    Use light theme instead of dark theme (default: dark)
+    --since    Only plot releases published on or after this date
+    --until    Only plot releases published before this date
+    --db       Query the releases from the SQLite index releases.sqlite instead
+    --repo     Repository to plot from the index (default: ethereum/execution-spec-tests)
+    --assets   Also plot the total asset size per release (needs assets.txt)
+    --vector   Also save every plot as SVG or PDF, may be repeated
+    --matrix   Render several variants in one run: the data is parsed once and
+               the plots are rendered in parallel worker processes. A variant
+               is a theme (dark or light) with optional outputs, PNG
+               resolutions in dpi or vector formats, e.g.
+               --matrix dark light:150,300,svg (default outputs: 150,300)
+    --jobs     Worker processes for --matrix (default: one per CPU)
 
 Requirements:
-    - releases.txt file (generated by fetch_release_data.py)
+    - releases.txt file (generated by fetch_release_data.py); its parsed table is
+      cached in cache/ (see release_data.py), and its columnar copy releases.cols/
+      is read instead of parsing the text when present
 
 Output:
     - eest_releases_timeline_dark.png / eest_releases_timeline_light.png: Standard resolution plot
     - eest_releases_timeline_dark_hires.png / eest_releases_timeline_light_hires.png: High resolution plot
+    - eest_asset_sizes_dark.png / eest_asset_sizes_light.png (+ _hires): Asset size plot (--assets)
+    - .svg / .pdf of each plot (--vector)
+    - <plot>_<theme>_<dpi>dpi.png: Other resolutions (--matrix)
+
+All files of a plot come from a single draw (see figure_export.py): the
+standard resolution PNG is downsampled from the high resolution one.
 """
 
+import os
+import re
 import sys
+import functools
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-import matplotlib
-matplotlib.use("Agg")  # Non-interactive backend for saving files
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 from collections import OrderedDict
 
-def check_data_file():
-    """Check if release data file exists."""
-    script_dir = Path(__file__).parent
-    releases_file = script_dir / "build" / "releases.txt"
+import release_db
+from build_cache import cached_data, cached_outputs, record_data, record_outputs, render_key, table_digest
+from decimation import decimate
+from figure_export import VECTOR_FORMATS, export_figure
+from label_placement import place_labels
+from release_data import add_version_columns, file_sha256, load_release_table, table_from_rows, take
+from shared_frame import attach_frame, share_frame
+
+REPO = "ethereum/execution-spec-tests"
+
+# Plot categories by tag prefix, tried in order (the first matching rule wins).
+# Renamed or related prefixes are merged into one category here.
+CATEGORY_RULES = [
+    ("stable", r"stable"),
+    ("pectra-devnet", r"pectra-devnet.*|devnet-1"),  # devnet-1 preceded the Pectra devnets
+    ("fusaka-devnet", r"fusaka-devnet.*"),
+    ("eip7692", r"eip7692"),
+    ("eip7692-prague", r"eip7692-prague"),
+    ("verkle", r"verkle|eip6800"),  # Both are Verkle (EIP-6800)
+    ("benchmark", r"benchmark|zkevm"),  # zkevm was renamed to benchmark
+]
+
+DEFAULT_DPIS = (150, 300)  # Standard and high resolution (_hires) PNG
+DEFAULT_VARIANTS = [(True, DEFAULT_DPIS, ())]  # (dark_mode, dpis, vector_formats)
+WATCH_DPIS = (150,)  # --watch previews: the standard resolution PNG only
+BUILD_DIR = Path(__file__).parent / "build"
+# Columns each plot reads: shared with --matrix workers and hashed for the build cache
+PLOT_COLUMNS = {
+    "timeline": ["date", "category", "label", "patch", "pre"],
+    "assets": ["date", "category", "size"],
+}
+# Modules reloaded by --watch when edited, dependencies first
+WATCHED_MODULES = [
+    "release_store", "release_data", "release_db", "decimation", "label_placement", "figure_export",
+    "shared_frame", "build_cache", "generate_plots",
+]
+DECIMATION_DPI = max(DEFAULT_DPIS)  # Lines keep at most four points per pixel column at this resolution
+
+def check_data_file(releases_file=None):
+    """Check if release data file (build/releases.txt unless given) exists."""
+    if releases_file is None:
+        script_dir = Path(__file__).parent
+        releases_file = script_dir / "build" / "releases.txt"
     if not releases_file.exists():
         print(f"Error: {releases_file} not found!")
         print("Please run 'uv run release_timeline/fetch_release_data.py' first to fetch release data.")
         sys.exit(1)
     return releases_file
 
-def parse_release_data(releases_file):
-    """Parse release data into DataFrame."""
+def parse_release_data(releases_file, since=None, until=None, db_file=None, repo=REPO):
+    """Parse release data into a release table (NumPy columns, see release_data.py).
+
+    The parsed table of releases_file is shared with fetch_release_data.py
+    and cached by content (see release_data.py), so unchanged data is not
+    parsed again. With db_file, only the matching rows of repo are queried from the SQLite
+    index instead. since/until (timezone-aware datetimes) restrict the
+    releases to [since, until).
+    """
     data = []
-    
-    with open(releases_file, "r") as f:
-        for line in f:
-            parts = line.strip().split("|")
-            if len(parts) >= 3:
-                tag = parts[0]
-                date_str = parts[1]
-                name = parts[2]
-                
-                # Parse date
-                date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                
-                # Categorize release
-                if "@" in tag:
-                    prefix = tag.split("@")[0]
-                    version = tag.split("@")[1]
-                else:
-                    prefix = "stable"
-                    version = tag
-                
-                data.append({
-                    "tag": tag, 
-                    "date": date, 
-                    "name": name, 
-                    "prefix": prefix, 
-                    "version": version
-                })
+    if db_file is not None:
+        rows = release_db.query_releases(release_db.connect(db_file), repo, since, until)
+        stored = add_version_columns(table_from_rows(rows))
+        print(f"Queried {len(rows)} releases of {repo} from {db_file}")
+    else:
+        stored = load_release_table(releases_file, since, until)
+    stored["projected"] = np.zeros(len(stored["date"]), dtype=bool)
     
     # Add forward-looking stable release (projected)
     forward_release = {
@@ -89,183 +136,198 @@ def parse_release_data(releases_file):
         "prefix": "stable", 
         "version": "v5.0.0"
     }
-    data.append(forward_release)
+    if not ((since and forward_release["date"] < since) or (until and forward_release["date"] >= until)):
+        data.append(forward_release)
     
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date")
+    # Append the projected release, sorted in by date
+    if data:
+        projected = add_version_columns(table_from_rows([
+            (row["tag"], int(row["date"].timestamp()), row["name"], row["prefix"], row["version"]) for row in data
+        ]))
+        projected["projected"] = np.ones(len(data), dtype=bool)
+        df = {name: np.concatenate([stored[name], projected[name]]) for name in stored}
+    else:
+        df = stored
+    # A window holding only the projected release still has something to plot
+    if not len(df["date"]) and (since or until):
+        start = f"{since:%Y-%m-%d}" if since else "the first release"
+        end = f"{until:%Y-%m-%d}" if until else "now"
+        print(f"Error: no releases between {start} and {end}")
+        sys.exit(1)
+    df = take(df, np.argsort(df["date"], kind="stable"))
+    df["category"] = categorize_releases(df["prefix"])
     
-    print(f"Parsed {len(df)} total releases (including projected)")
+    print(f"Parsed {len(df['date'])} total releases (including projected)")
     return df
 
+def compile_classifier(rules=CATEGORY_RULES):
+    """Compile category rules into a single regex; returns a prefix -> category function."""
+    pattern = re.compile("|".join(f"(?P<rule{i}>{regex})" for i, (_, regex) in enumerate(rules)))
+    
+    def classify(prefix):
+        match = pattern.fullmatch(prefix)
+        return rules[int(match.lastgroup[len("rule"):])][0] if match else None
+    
+    return classify
+
+def categorize_releases(prefixes, rules=CATEGORY_RULES):
+    """Return the category of each release ("" if no rule matches).
+
+    Only the distinct prefixes are classified; the releases then take their
+    category by index, in a single pass.
+    """
+    classify = compile_classifier(rules)
+    uniques, codes = np.unique(prefixes, return_inverse=True)
+    return np.array([classify(prefix) or "" for prefix in uniques], dtype=str)[codes]
+
+def build_prefix_index(df):
+    """Index the first and latest release and the release count of each prefix.
+
+    df must be sorted by date; returns prefix -> {count, first_tag,
+    first_date, latest_tag, latest_date}, latest first.
+    """
+    prefixes, first, counts = np.unique(df["prefix"], return_index=True, return_counts=True)
+    last = len(df["prefix"]) - 1 - np.unique(df["prefix"][::-1], return_index=True)[1]
+    index = {
+        str(prefix): {
+            "count": int(count),
+            "first_tag": str(df["tag"][i]),
+            "first_date": df["date"][i],
+            "latest_tag": str(df["tag"][j]),
+            "latest_date": df["date"][j],
+        }
+        for prefix, count, i, j in zip(prefixes, counts, first, last)
+    }
+    return dict(sorted(index.items(), key=lambda item: item[1]["latest_date"], reverse=True))
+
+MARKER_SIZE = 8  # Points
+LABEL_FONTSIZE = 14
+
+# Plotted categories in legend order; colors come from the theme
+CATEGORIES = OrderedDict([
+    ("stable", {"label": "Full Releases", "marker": "o", "zorder": 5}),
+    ("pectra-devnet", {"label": "Pectra Devnet", "marker": "s", "zorder": 4}),
+    ("fusaka-devnet", {"label": "Fusaka Devnet", "marker": "^", "zorder": 4}),
+    ("eip7692", {"label": "EIP-7692 (EOF, Cancun)", "marker": "p", "zorder": 3}),
+    ("eip7692-prague", {"label": "EIP-7692 (EOF, Prague)", "marker": "P", "zorder": 3}),
+    ("verkle", {"label": "EIP-6800 (Verkle)", "marker": "h", "zorder": 3}),
+    ("benchmark", {"label": "Benchmark", "marker": "*", "zorder": 3}),
+])
+
 def get_theme_config(dark_mode=True):
-    """Get theme configuration for light or dark mode."""
+    """Get theme configuration for light or dark mode.
+
+    A theme only holds colors and styling applied to already built artists
+    (see apply_theme); the dark theme matches matplotlib's dark_background
+    style and the light theme seaborn-v0_8-whitegrid.
+    """
     if dark_mode:
         return {
-            "style": "dark_background",
             "bg_color": "#0a0a0a",
+            "axes_bg": "black",
             "legend_bg": "#1a1a1a",
             "text_color": "white",
             "edge_color": "white",
-            "categories": OrderedDict([
-                ("stable", {"color": "#00ff00", "label": "Full Releases", "marker": "o", "zorder": 5}),
-                ("pectra-devnet", {"color": "#ff00ff", "label": "Pectra Devnet", "marker": "s", "zorder": 4}),
-                ("fusaka-devnet", {"color": "#00ffff", "label": "Fusaka Devnet", "marker": "^", "zorder": 4}),
-                ("eip7692", {"color": "#ff8800", "label": "EIP-7692 (EOF, Cancun)", "marker": "p", "zorder": 3}),
-                ("eip7692-prague", {"color": "#ff8800", "label": "EIP-7692 (EOF, Prague)", "marker": "P", "zorder": 3}),
-                ("verkle", {"color": "#8800ff", "label": "EIP-6800 (Verkle)", "marker": "h", "zorder": 3}),
-                ("benchmark", {"color": "#ff0088", "label": "Benchmark", "marker": "*", "zorder": 3}),
-                ("devnet-1", {"color": "#ffff00", "label": "Devnet-1", "marker": "d", "zorder": 4}),
-                ("zkevm", {"color": "#ff0088", "label": "zkEVM/Benchmark", "marker": "v", "zorder": 3}),
-                ("eip6800", {"color": "#8800ff", "label": "EIP-6800 (Verkle)", "marker": "x", "zorder": 3}),
-            ])
+            "spine_color": "white",
+            "spine_width": 0.8,
+            "grid_color": "white",
+            "tick_length": 3.5,
+            "font": ["DejaVu Sans"],
+            "colors": {
+                "stable": "#00ff00",
+                "pectra-devnet": "#ff00ff",
+                "fusaka-devnet": "#00ffff",
+                "eip7692": "#ff8800",
+                "eip7692-prague": "#ff8800",
+                "verkle": "#8800ff",
+                "benchmark": "#ff0088",
+            },
         }
     else:
         return {
-            "style": "seaborn-v0_8-whitegrid",
             "bg_color": "white",
+            "axes_bg": "white",
             "legend_bg": "white", 
-            "text_color": "black",
+            "text_color": "0.15",
             "edge_color": "black",
-            "categories": OrderedDict([
-                ("stable", {"color": "#006600", "label": "Full Releases", "marker": "o", "zorder": 5}),
-                ("pectra-devnet", {"color": "#cc00cc", "label": "Pectra Devnet", "marker": "s", "zorder": 4}),
-                ("fusaka-devnet", {"color": "#0088aa", "label": "Fusaka Devnet", "marker": "^", "zorder": 4}),
-                ("eip7692", {"color": "#cc6600", "label": "EIP-7692 (EOF, Cancun)", "marker": "p", "zorder": 3}),
-                ("eip7692-prague", {"color": "#cc6600", "label": "EIP-7692 (EOF, Prague)", "marker": "P", "zorder": 3}),
-                ("verkle", {"color": "#6600cc", "label": "EIP-6800 (Verkle)", "marker": "h", "zorder": 3}),
-                ("benchmark", {"color": "#cc0066", "label": "Benchmark", "marker": "*", "zorder": 3}),
-                ("devnet-1", {"color": "#cccc00", "label": "Devnet-1", "marker": "d", "zorder": 4}),
-                ("zkevm", {"color": "#cc0066", "label": "zkEVM/Benchmark", "marker": "v", "zorder": 3}),
-                ("eip6800", {"color": "#6600cc", "label": "EIP-6800 (Verkle)", "marker": "x", "zorder": 3}),
-            ])
+            "spine_color": "0.8",
+            "spine_width": 1.0,
+            "grid_color": "0.8",
+            "tick_length": 0,
+            "font": ["Arial", "Liberation Sans", "DejaVu Sans"],
+            "colors": {
+                "stable": "#006600",
+                "pectra-devnet": "#cc00cc",
+                "fusaka-devnet": "#0088aa",
+                "eip7692": "#cc6600",
+                "eip7692-prague": "#cc6600",
+                "verkle": "#6600cc",
+                "benchmark": "#cc0066",
+            },
         }
 
-def create_visualization(df, dark_mode=True):
-    """Create the release timeline visualization."""
-    print(f"Creating visualization in {'dark' if dark_mode else 'light'} mode...")
-    
-    # Get theme configuration
-    theme = get_theme_config(dark_mode)
-    categories = theme["categories"]
-    
-    # Group by prefix
-    grouped = {}
-    for prefix in categories.keys():
-        if prefix == "stable":
-            mask = ~df["tag"].str.contains("@")
-        elif prefix == "pectra-devnet":
-            mask = df["prefix"].str.startswith("pectra-devnet") | (df["prefix"] == "devnet-1")
-        elif prefix == "fusaka-devnet":
-            mask = df["prefix"].str.startswith("fusaka-devnet")
-        elif prefix == "devnet-1":
-            # Skip devnet-1 as it's combined with pectra-devnet
-            continue
-        elif prefix == "verkle":
-            # Combine verkle and eip6800 as they're both Verkle (EIP-6800)
-            mask = (df["prefix"] == "verkle") | (df["prefix"] == "eip6800")
-        elif prefix == "benchmark":
-            # Combine zkevm and benchmark (zkevm was renamed to benchmark)
-            mask = (df["prefix"] == "benchmark") | (df["prefix"] == "zkevm")
-        elif prefix == "zkevm":
-            # Skip zkevm as it's combined with benchmark
-            continue
-        elif prefix == "eip6800":
-            # Skip eip6800 as it's combined with verkle
-            continue
-        else:
-            mask = df["prefix"] == prefix
-        
-        if mask.any():
-            grouped[prefix] = df[mask].copy().sort_values("date")
-            # Add cumulative count for y-axis
-            grouped[prefix]["cumulative"] = range(1, len(grouped[prefix]) + 1)
+def group_by_category(df, categories=CATEGORIES):
+    """Split releases into the plotted categories (in legend order), each sorted by date."""
+    masks = {category: df["category"] == category for category in categories}
+    return {category: take(df, mask) for category, mask in masks.items() if mask.any()}
+
+def build_figure(title, xlabel, ylabel):
+    """Create the figure and axes shared by all plots; returns its (empty) figure model.
+
+    The model holds every artist a theme restyles: data lines, their markers
+    and labels per category, boxed texts, and the legend (added by
+    finish_figure).
+    It also keeps what apply_theme lays out for the final layout: the full
+    data of each line (series, see decimate_lines) and the releases to label
+    (releases, see label_releases).
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
     
-    # Create the plot
-    plt.style.use(theme["style"])
-    fig, ax = plt.subplots(figsize=(16, 10), dpi=100)
+    fig = Figure(figsize=(16, 10), dpi=100)
+    FigureCanvasAgg(fig)  # Measures text for layout and label placement
+    ax = fig.subplots()
+    ax.set_xlabel(xlabel, fontsize=22, fontweight="bold")
+    ax.set_ylabel(ylabel, fontsize=22, fontweight="bold")
+    ax.set_title(title, fontsize=24, fontweight="bold", pad=20)
+    subplotpars = {name: getattr(fig.subplotpars, name) for name in ("left", "bottom", "right", "top")}
+    return {
+        "fig": fig, "ax": ax, "subplotpars": subplotpars, "lines": {}, "markers": {}, "labels": {}, "boxes": [],
+        "legend": None, "series": {}, "releases": None,
+    }
+
+def plot_category(model, category, x, y, count):
+    """Plot one category's releases as a dashed line with markers.
+
+    The markers are an artist of their own, so decimate_lines thins out the
+    line only and every release keeps its marker. The line carries the marker
+    style for its legend entry alone (markevery=[] draws none on the axes).
+    """
+    cat = CATEGORIES[category]
+    style = dict(marker=cat["marker"], markersize=MARKER_SIZE, markeredgewidth=0.5, alpha=0.8, zorder=cat["zorder"])
+    (line,) = model["ax"].plot(
+        x,
+        y,
+        **style,
+        markevery=[],
+        linestyle="--",
+        linewidth=1.5,
+        label=f"{cat['label']} ({count} releases)",
+    )
+    (model["markers"][category],) = model["ax"].plot(x, y, **style, linestyle="none", color=line.get_color())
+    model["lines"][category] = line
+
+def finish_figure(model):
+    """Add the date axis, grid and legend of a plot."""
+    import matplotlib.dates as mdates
     
-    # Plot each category
-    for prefix, data in grouped.items():
-        if prefix in categories:
-            cat = categories[prefix]
-            
-            # Plot line with markers
-            ax.plot(
-                data["date"],
-                data["cumulative"],
-                color=cat["color"],
-                marker=cat["marker"],
-                markersize=8,
-                markeredgecolor=theme["edge_color"],
-                markeredgewidth=0.5,
-                linestyle="--",
-                linewidth=1.5,
-                alpha=0.8,
-                label=f"{cat['label']} ({len(data)} releases)",
-                zorder=cat["zorder"],
-            )
-            
-            # Add version labels for selected points
-            n_labels = min(6, len(data))  # Maximum 6 labels per category to reduce clutter
-            if n_labels > 0:
-                if len(data) == 1:
-                    indices = [0]
-                elif len(data) == 2:
-                    indices = [0, 1] 
-                else:
-                    # Show first, last, and some intermediate points
-                    indices = [0, len(data) - 1]  # Always show first and last
-                    if n_labels > 2:
-                        # Add evenly spaced intermediate points
-                        intermediate = np.linspace(1, len(data) - 2, n_labels - 2, dtype=int)
-                        indices.extend(intermediate)
-                    indices = sorted(set(indices))
-                
-                for idx in indices:
-                    row = data.iloc[idx]
-                    # Simplify version display
-                    version_text = row["version"].replace("v", "")
-                    if "@" in row["tag"]:
-                        tag_parts = row["tag"].split("@")
-                        prefix_part = tag_parts[0]
-                        version_part = tag_parts[1].replace("v", "")
-                        
-                        # For devnet releases, show devnet-number@version
-                        if "devnet" in prefix_part:
-                            # Extract devnet number/name after the last dash
-                            if "-" in prefix_part:
-                                devnet_id = prefix_part.split("-")[-1]
-                                version_text = f"{devnet_id}@{version_part}"
-                            else:
-                                version_text = version_part
-                        else:
-                            version_text = version_part
-                    
-                    # Add small offset to avoid overlapping
-                    offset_y = 0.2 * (idx % 3 - 1)
-                    
-                    ax.annotate(
-                        version_text,
-                        xy=(row["date"], row["cumulative"]),
-                        xytext=(5, 5 + offset_y * 10),
-                        textcoords="offset points",
-                        fontsize=14,
-                        color=cat["color"],
-                        alpha=0.9,
-                        ha="left",
-                    )
-    
-    # Formatting with larger fonts for slide visibility
-    ax.set_xlabel("Release Date", fontsize=22, fontweight="bold")
-    ax.set_ylabel("Cumulative Number of Releases", fontsize=22, fontweight="bold")
-    ax.set_title("Ethereum Execution Spec Tests Vector Releases", fontsize=24, fontweight="bold", pad=20)
+    ax = model["ax"]
     
     # Date formatting on x-axis with larger labels
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %Y"))
     ax.xaxis.set_major_locator(mdates.MonthLocator(interval=3))
-    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha="right", fontsize=18)
+    for label in ax.xaxis.get_majorticklabels():
+        label.set(rotation=45, ha="right", fontsize=18)
     ax.tick_params(axis="y", labelsize=16)
     
     # Grid
@@ -273,79 +335,587 @@ def create_visualization(df, dark_mode=True):
     ax.set_axisbelow(True)
     
     # Legend with larger font
-    legend = ax.legend(
-        loc="upper left", frameon=True, fancybox=True, framealpha=0.9, edgecolor=theme["edge_color"], fontsize=18
+    model["legend"] = ax.legend(loc="upper left", frameon=True, fancybox=True, framealpha=0.9, fontsize=18)
+
+@functools.cache
+def resolve_font(families):
+    """Return the first installed font family of a preference list (like font.sans-serif)."""
+    from matplotlib import font_manager
+    
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    return next((family for family in families if family in installed), "sans-serif")
+
+def apply_theme(model, theme):
+    """Restyle the artists of a built figure model in a theme.
+
+    Only colors, fonts and tick styles change, so switching themes costs a
+    layout pass, placing the labels and a draw instead of rebuilding the
+    figure.
+    """
+    from matplotlib.text import Text
+    
+    fig, ax, legend = model["fig"], model["ax"], model["legend"]
+    font = resolve_font(tuple(theme["font"]))
+    fig.patch.set_facecolor(theme["bg_color"])
+    ax.set_facecolor(theme["axes_bg"])
+    for spine in ax.spines.values():
+        spine.set_edgecolor(theme["spine_color"])
+        spine.set_linewidth(theme["spine_width"])
+    ax.tick_params(
+        which="both", color=theme["text_color"], labelcolor=theme["text_color"], length=theme["tick_length"],
+        labelfontfamily=font,
     )
+    ax.grid(True, color=theme["grid_color"])
+    for text in [ax.title, ax.xaxis.label, ax.yaxis.label, *legend.get_texts(), *model["boxes"]]:
+        text.set_color(theme["text_color"])
+    for text in fig.findobj(Text):
+        text.set_fontfamily(font)
+    
+    # Data lines, their markers (and their copies in the legend) in category colors
+    handles = dict(zip([text.get_text() for text in legend.get_texts()], legend.legend_handles))
+    for category, line in model["lines"].items():
+        color = theme["colors"][category]
+        for artist in (line, model["markers"][category], handles[line.get_label()]):
+            artist.set_color(color)
+            artist.set_markeredgecolor(theme["edge_color"])
+    
     legend.get_frame().set_facecolor(theme["legend_bg"])
+    legend.get_frame().set_edgecolor(theme["edge_color"])
+    for box in model["boxes"]:
+        box.get_bbox_patch().set_facecolor(theme["legend_bg"])
+        box.get_bbox_patch().set_edgecolor(theme["edge_color"])
+    
+    # Fonts and tick lengths change the extents; lay out from the initial
+    # subplot parameters, so a theme always ends up with the same layout
+    fig.subplots_adjust(**model["subplotpars"])
+    fig.tight_layout()
+    
+    # Labels are measured in the theme's font and placed (and lines thinned
+    # out) for this final layout
+    keep = {}
+    if model["releases"] is not None:
+        releases = model["releases"]
+        labelled = label_releases(model, releases, font)
+        print(f"Labelled {labelled.sum()} of {len(releases['date'])} releases")
+        categories = releases["category"]
+        keep = {category: np.flatnonzero(labelled[categories == category]) for category in model["lines"]}
+        for category, labels in model["labels"].items():
+            for label in labels:
+                label.set_color(theme["colors"][category])
+    decimate_lines(model, keep)
+
+def label_priorities(df):
+    """Rank releases for labelling (0 is labelled first).
+
+    The first and last release of each category come first, then categories
+    in legend order; within a category major and minor releases (x.y.0)
+    before patch and pre-releases, newest first.
+    """
+    categories, codes = np.unique(df["category"], return_inverse=True)
+    ends = np.zeros(len(codes), dtype=bool)
+    for code in range(len(categories)):
+        ends[np.flatnonzero(codes == code)[[0, -1]]] = True
+    minor = (df["patch"] == 0) & (df["pre"] == "")  # patch is -1 if not numeric
+    rule_order = [category for category, _ in CATEGORY_RULES]
+    order = np.lexsort((
+        -df["date"].astype(np.int64),
+        ~minor,
+        np.array([rule_order.index(category) for category in categories], dtype=np.int64)[codes],
+        ~ends,
+    ))
+    ranks = np.empty(len(codes), dtype=np.int64)
+    ranks[order] = np.arange(len(codes))
+    return ranks
+
+def label_releases(model, df, font):
+    """Annotate every release of df whose version label fits (see label_placement.py).
+
+    df holds the plotted releases with their cumulative count. Labels avoid
+    each other, the markers, the legend and text boxes, and stay inside the
+    axes, as laid out now (labels stay inside the axes, so they do not change
+    the layout). Text extents are measured once per distinct label in font,
+    and only the labels placed become artists, replacing those of an earlier
+    call. Returns whether each release was labelled.
+    """
+    import matplotlib.dates as mdates
+    from matplotlib import font_manager
+    
+    fig, ax = model["fig"], model["ax"]
+    for label in [label for labels in model["labels"].values() for label in labels]:
+        label.remove()
+    model["labels"] = {}
+    ax.autoscale_view()
+    renderer = fig.canvas.get_renderer()
+    points = 72 / fig.dpi  # Display pixels per point
+    
+    def extent(bbox):
+        return (bbox.x0 * points, bbox.y0 * points, bbox.x1 * points, bbox.y1 * points)
+    
+    x = mdates.date2num(df["date"])
+    y = df["cumulative"]
+    anchors = ax.transData.transform(np.column_stack([x, y])) * points
+    
+    # Label extents come from character metrics: the width is the sum of the
+    # advances (measured from runs of each character) and the height spans
+    # the highest ascent and lowest descent, so text is measured once per
+    # character instead of once per label
+    prop = font_manager.FontProperties(family=font, size=LABEL_FONTSIZE)
+    labels = df["label"]
+    distinct = list(dict.fromkeys(labels))
+    
+    def measure(text):
+        return renderer.get_text_width_height_descent(text, prop, ismath=False)
+    
+    metrics = {}
+    for char in set("".join(distinct)):
+        width, height, descent = measure(char)
+        metrics[char] = ((measure(char * 11)[0] - width) / 10 * points, (height - descent) * points, descent * points)
+    measured = {}
+    for label in distinct:
+        label_metrics = [metrics[char] for char in label]
+        measured[label] = (
+            sum(advance for advance, _, _ in label_metrics),
+            max(ascent for _, ascent, _ in label_metrics) + max(descent for _, _, descent in label_metrics),
+        )
+    
+    # Markers, the legend and boxed texts must stay visible; markers closer
+    # than a point are one obstacle
+    half = MARKER_SIZE / 2 + 0.5
+    markers = np.unique(np.round(anchors), axis=0)
+    obstacles = [(px - half, py - half, px + half, py + half) for px, py in markers]
+    obstacles.append(extent(model["legend"].get_window_extent(renderer)))
+    for box in model["boxes"]:
+        box.update_bbox_position_size(renderer)
+        obstacles.append(extent(box.get_bbox_patch().get_window_extent(renderer)))
+    
+    placements = place_labels(
+        [tuple(anchor) for anchor in anchors], [measured[label] for label in labels], label_priorities(df),
+        extent(ax.get_window_extent(renderer)), obstacles,
+    )
+    categories = df["category"]
+    for i, placement in enumerate(placements):
+        if placement is None:
+            continue
+        offset, (ha, va) = placement
+        model["labels"].setdefault(categories[i], []).append(ax.annotate(
+            labels[i],
+            xy=(x[i], y[i]),
+            xytext=offset,
+            textcoords="offset points",
+            fontsize=LABEL_FONTSIZE,
+            fontfamily=font,
+            alpha=0.9,
+            ha=ha,
+            va=va,
+        ))
+    return np.array([placement is not None for placement in placements], dtype=bool)
+
+def decimate_lines(model, keep=None):
+    """Thin out each category's line to a few points per pixel column (see decimation.py).
+
+    Columns are those of the plot at DECIMATION_DPI, so dense histories draw
+    as fast as short ones and look the same. keep maps a category to the
+    positions of points that must stay on the line (e.g. labelled releases).
+    Lines are thinned out from their full data, so this can run again after
+    the layout changed; the markers are separate artists (see plot_category)
+    and keep every point.
+    """
+    fig, ax = model["fig"], model["ax"]
+    ax.autoscale_view()
+    pixels = DECIMATION_DPI / fig.dpi  # Output pixels per display pixel
+    for category, line in model["lines"].items():
+        xy = model["series"].setdefault(category, line.get_xydata())
+        kept = decimate(ax.transData.transform(xy)[:, 0] * pixels, xy[:, 1], (keep or {}).get(category, ()))
+        line.set_data(xy[kept, 0], xy[kept, 1])
+
+def build_timeline(df):
+    """Build the release timeline figure; returns its figure model (see build_figure)."""
+    print("Building release timeline...")
+    
+    # Group by category, with the cumulative count for the y-axis (df is sorted by date)
+    cumulative = np.zeros(len(df["date"]), dtype=np.int64)
+    for category in np.unique(df["category"]):
+        rows = np.flatnonzero(df["category"] == category)
+        cumulative[rows] = np.arange(1, len(rows) + 1)
+    df = {**df, "cumulative": cumulative}
+    grouped = group_by_category(df)
+    
+    # Create the plot, with larger fonts for slide visibility
+    model = build_figure(
+        "Ethereum Execution Spec Tests Vector Releases", "Release Date", "Cumulative Number of Releases"
+    )
+    ax = model["ax"]
+    
+    # Plot each category
+    for prefix, data in grouped.items():
+        # Plot line with markers
+        plot_category(model, prefix, data["date"], data["cumulative"], len(data["date"]))
+    
+    finish_figure(model)
     
     # Add total releases count - positioned at Nov 2023, y=5
-    total_releases = len(df)
-    ax.text(
+    total_releases = len(df["date"])
+    model["boxes"].append(ax.text(
         datetime(2023, 11, 1, tzinfo=timezone.utc),
         5,
         f"Total: {total_releases} releases",
         fontsize=20,
         ha="center",
         va="center",
-        bbox=dict(boxstyle="round", facecolor=theme["legend_bg"], edgecolor=theme["edge_color"], alpha=0.8),
-    )
-    
-    # Adjust layout
-    plt.tight_layout()
+        bbox=dict(boxstyle="round", alpha=0.8),
+        clip_on=True,  # Hidden (and left out of the layout) when a date window excludes its position
+    ))
     
-    # Create build directory if it doesn't exist
-    script_dir = Path(__file__).parent
-    build_dir = script_dir / "build"
-    build_dir.mkdir(exist_ok=True)
-    
-    # Save the plots
+    # Version labels go on as many releases as fit without overlaps, placed
+    # by apply_theme in the theme's font and layout; dense lines are drawn at
+    # screen resolution, keeping every labelled release
+    model["releases"] = take(df, df["category"] != "")
+    return model
+
+def create_visualization(df, variants=DEFAULT_VARIANTS):
+    """Create the release timeline visualization in every (dark_mode, dpis, vector_formats) variant."""
+    digest = table_digest(df, PLOT_COLUMNS["timeline"])
+    return save_variants(functools.partial(build_timeline, df), "eest_releases_timeline", variants, digest)
+
+def save_variants(build, name, variants, data_digest):
+    """Save the figure model returned by build() in every variant, re-theming the same artists in between.
+
+    Variants whose files are up to date for the same data (data_digest),
+    theme, outputs and plotting code are skipped (see build_cache.py); the
+    figure is only built if any variant is left.
+    """
+    output_files = []
+    model = None
+    for dark_mode, dpis, vector_formats in variants:
+        theme = get_theme_config(dark_mode)
+        key = render_key(name, data_digest, theme, sorted(dpis), sorted(vector_formats))
+        cached = cached_outputs(BUILD_DIR, key)
+        if cached is not None:
+            for output_file in cached:
+                print(f"Plot up to date: {output_file}")
+            output_files.extend(cached)
+            continue
+        
+        if model is None:
+            model = build()
+        print(f"Applying {'dark' if dark_mode else 'light'} theme...")
+        apply_theme(model, theme)
+        
+        # Save the plots (standard, high-res for presentations and vector formats)
+        saved = save_plot(model["fig"], name, dark_mode, theme, vector_formats, dpis)
+        record_outputs(BUILD_DIR, key, saved)
+        output_files.extend(saved)
+    return output_files
+
+def save_plot(fig, name, dark_mode, theme, vector_formats=(), dpis=DEFAULT_DPIS):
+    """Save fig as build/<name>_<theme>.png (150 dpi), _hires.png (300 dpi) and vector formats from a single draw.
+
+    Other resolutions are saved as _<dpi>dpi.png.
+    """
+    BUILD_DIR.mkdir(exist_ok=True)
     mode_suffix = "_dark" if dark_mode else "_light"
-    output_file = build_dir / f"eest_releases_timeline{mode_suffix}.png"
-    plt.savefig(output_file, dpi=150, facecolor=theme["bg_color"], edgecolor="none", bbox_inches="tight")
-    print(f"Plot saved to: {output_file}")
-    
-    # Also save a high-res version for presentations
-    output_file_hires = build_dir / f"eest_releases_timeline{mode_suffix}_hires.png"
-    plt.savefig(output_file_hires, dpi=300, facecolor=theme["bg_color"], edgecolor="none", bbox_inches="tight")
-    print(f"High-res plot saved to: {output_file_hires}")
-    
-    plt.close()
+    dpi_suffixes = {150: "", 300: "_hires"}
+    outputs = {BUILD_DIR / f"{name}{mode_suffix}{dpi_suffixes.get(dpi, f'_{dpi}dpi')}.png": dpi for dpi in dpis}
+    outputs.update({BUILD_DIR / f"{name}{mode_suffix}.{fmt}": None for fmt in vector_formats})
+    output_files = export_figure(fig, outputs, theme["bg_color"])
+    for output_file in output_files:
+        print(f"Plot saved to: {output_file}")
+    return output_files
+
+def parse_asset_data(assets_file, df):
+    """Sum the asset sizes of each release in df (tag|date|asset|size|downloads lines).
+
+    Returns the releases of df that have assets, with size and
+    download_count columns.
+    """
+    print(f"Parsing asset data from {assets_file}...")
+    totals = {}
+    assets = 0
+    with open(assets_file, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            tag = line.split("|", 1)[0]
+            size, download_count = line.rsplit("|", 2)[1:]  # Asset names may contain "|"
+            total = totals.setdefault(tag, [0, 0])
+            total[0] += int(size)
+            total[1] += int(download_count)
+            assets += 1
+    asset_df = take(df, np.array([tag in totals for tag in df["tag"]], dtype=bool))
+    sums = np.array([totals[tag] for tag in asset_df["tag"]], dtype=np.int64).reshape(-1, 2)
+    asset_df["size"], asset_df["download_count"] = sums[:, 0], sums[:, 1]
+    print(f"Parsed {assets} assets of {len(asset_df['date'])} releases")
+    return asset_df
+
+def build_asset_plot(asset_df):
+    """Build the asset size per release figure; returns its figure model (see build_figure)."""
+    print("Building asset size plot...")
     
-    return output_file, output_file_hires
+    model = build_figure(
+        "Ethereum Execution Spec Tests Release Asset Sizes", "Release Date", "Total Asset Size per Release (GB)"
+    )
+    for prefix, data in group_by_category(asset_df).items():
+        plot_category(model, prefix, data["date"], data["size"] / 1e9, len(data["date"]))
+    finish_figure(model)
+    return model
 
-def main():
-    """Main execution function."""
-    # Parse command line arguments
+def create_asset_visualization(asset_df, variants=DEFAULT_VARIANTS):
+    """Create the asset size per release visualization in every (dark_mode, dpis, vector_formats) variant."""
+    digest = table_digest(asset_df, PLOT_COLUMNS["assets"])
+    return save_variants(functools.partial(build_asset_plot, asset_df), "eest_asset_sizes", variants, digest)
+
+# Plot -> (output name, build function)
+PLOTS = {
+    "timeline": ("eest_releases_timeline", build_timeline),
+    "assets": ("eest_asset_sizes", build_asset_plot),
+}
+
+# Plot -> (create function, columns it reads), rendered by --matrix workers
+MATRIX_PLOTS = {
+    "timeline": (create_visualization, PLOT_COLUMNS["timeline"]),
+    "assets": (create_asset_visualization, PLOT_COLUMNS["assets"]),
+}
+
+def parse_matrix_variant(value):
+    """Parse a --matrix variant THEME[:OUTPUT,...] into (dark_mode, dpis, vector_formats).
+
+    Outputs are PNG resolutions (dpi) or vector formats; the default is the
+    standard and high resolution PNG.
+    """
+    theme_name, _, outputs = value.partition(":")
+    if theme_name not in ("dark", "light"):
+        raise argparse.ArgumentTypeError(f"unknown theme {theme_name!r} (dark or light)")
+    dpis, vector_formats = [], []
+    for output in outputs.split(",") if outputs else []:
+        if output.isdigit() and int(output) > 0:
+            dpis.append(int(output))
+        elif output in VECTOR_FORMATS:
+            vector_formats.append(output)
+        else:
+            raise argparse.ArgumentTypeError(f"invalid output {output!r} (a dpi or one of {', '.join(VECTOR_FORMATS)})")
+    return theme_name == "dark", tuple(dpis) if outputs else DEFAULT_DPIS, tuple(vector_formats)
+
+def render_variants(plot, layout, variants):
+    """Render one plot in some --matrix variants in a worker process from the shared columns."""
+    create, _ = MATRIX_PLOTS[plot]
+    return attach_frame(layout, lambda df: create(df, variants))
+
+def render_matrix(frames, variants, jobs=None):
+    """Render every plot in frames (plot -> release table) in every variant on a process pool.
+
+    The data is parsed once by the caller; workers read the plotted columns
+    from shared memory (see shared_frame.py) instead of unpickling a copy of
+    the frames. Each worker builds its plot once and re-themes it for a
+    share of the variants, so a plot is only built once per worker. Returns
+    the files created.
+    """
+    jobs = jobs or os.cpu_count()
+    shares = max(1, min(len(variants), jobs // len(frames)))
+    blocks, layouts = [], {}
+    try:
+        for plot, df in frames.items():
+            block, layouts[plot] = share_frame(df, MATRIX_PLOTS[plot][1])
+            blocks.append(block)
+        tasks = [(plot, variants[share::shares]) for share in range(shares) for plot in frames]
+        print(f"Rendering {len(variants) * len(frames)} plots in {len(tasks)} tasks with up to {jobs} workers...")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(render_variants, plot, layouts[plot], share) for plot, share in tasks]
+            return [output_file for future in futures for output_file in future.result()]
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def parse_date_arg(value):
+    """Parse a YYYY-MM-DD command line date as midnight UTC."""
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+def parse_args():
+    """Parse and check the command line arguments."""
     parser = argparse.ArgumentParser(description="Generate EEST Release Timeline Visualization")
     parser.add_argument("--light", action="store_true", help="Use light theme instead of dark theme")
+    parser.add_argument("--since", type=parse_date_arg, help="Only plot releases published on or after this date")
+    parser.add_argument("--until", type=parse_date_arg, help="Only plot releases published before this date")
+    parser.add_argument("--db", action="store_true", help="Query releases from the SQLite index releases.sqlite")
+    parser.add_argument("--repo", default=REPO, help=f"Repository to plot from the index (default: {REPO})")
+    parser.add_argument("--assets", action="store_true", help="Also plot the total asset size per release")
+    parser.add_argument(
+        "--vector", action="append", choices=VECTOR_FORMATS, default=[],
+        help="Also save the plots in this vector format, may be repeated",
+    )
+    parser.add_argument(
+        "--matrix", nargs="+", type=parse_matrix_variant, metavar="THEME[:OUTPUT,...]",
+        help="Render these variants in parallel from one parse, e.g. dark light:150,svg (replaces --light/--vector)",
+    )
+    parser.add_argument("--jobs", type=int, help="Worker processes for --matrix (default: one per CPU)")
+    parser.add_argument(
+        "--watch", action="store_true", help="Keep running and re-render whenever the data or plotting code changes"
+    )
     args = parser.parse_args()
-    
+    if args.matrix and (args.light or args.vector):
+        parser.error("--matrix replaces --light and --vector")
+    if args.matrix and args.watch:
+        parser.error("--watch renders in its own process and does not support --matrix")
+    return args
+
+def summarize_frames(frames):
+    """Return the data record of the parsed frames: each plot's data digest and the summary figures."""
+    df = frames["timeline"]
+    record = {
+        "digests": {plot: table_digest(frame, PLOT_COLUMNS[plot]) for plot, frame in frames.items()},
+        "total": len(df["date"]),
+        "latest_stable": None,
+    }
+    prefix_index = build_prefix_index(take(df, ~df["projected"]))  # Published releases only
+    if "stable" in prefix_index:
+        stable = prefix_index["stable"]
+        record["latest_stable"] = {
+            "tag": stable["latest_tag"], "date": str(stable["latest_date"].astype("datetime64[D]")),
+            "count": stable["count"],
+        }
+    return record
+
+def generate(args, plots=("timeline", "assets"), dpis=DEFAULT_DPIS):
+    """Parse the release data and render the plots (those of plots that args asks for); returns the files.
+
+    The data is only parsed if a plot has to be rendered or the input files
+    have no data record yet (see build_cache.py).
+    """
     dark_mode = not args.light
     theme_name = "dark" if dark_mode else "light"
     
     print("=== EEST Release Timeline Plot Generator ===")
-    print(f"Using {theme_name} theme")
+    if args.matrix:
+        print(f"Rendering {len(args.matrix)} variants")
+    else:
+        print(f"Using {theme_name} theme")
     print()
     
     # Step 1: Check if data file exists
-    releases_file = check_data_file()
-    print(f"Using release data from: {releases_file}")
+    if args.db:
+        db_file = check_data_file(release_db.default_db_file())
+        releases_file = None
+        print(f"Using release index: {db_file}")
+    else:
+        db_file = None
+        releases_file = check_data_file()
+        print(f"Using release data from: {releases_file}")
+    
+    assets_file = check_data_file(Path(__file__).parent / "build" / "assets.txt") if args.assets else None
     
-    # Step 2: Parse data into DataFrame
-    df = parse_release_data(releases_file)
+    # Step 2: Parse data into release tables, when first needed
+    @functools.cache
+    def frames():
+        df = parse_release_data(releases_file, args.since, args.until, db_file, args.repo)
+        if assets_file is None:
+            return {"timeline": df}
+        return {"timeline": df, "assets": parse_asset_data(assets_file, df)}
     
-    # Step 3: Create visualization
-    plot_file, plot_file_hires = create_visualization(df, dark_mode)
+    data_key = render_key("data", {
+        "source": file_sha256(db_file or releases_file),
+        "repo": args.repo if db_file else None,
+        "since": args.since,
+        "until": args.until,
+        "assets": assets_file and file_sha256(assets_file),
+    })
+    record = cached_data(BUILD_DIR, data_key)
+    if record is None:
+        record = summarize_frames(frames())
+        record_data(BUILD_DIR, data_key, record)
+    
+    if args.matrix:
+        # Steps 3 and 4: every variant of every plot on a process pool
+        plot_files = render_matrix(frames(), args.matrix, args.jobs)
+    else:
+        variants = [(dark_mode, dpis, tuple(args.vector))]
+        
+        # Steps 3 and 4: the release timeline and the asset sizes (optional)
+        plot_files = []
+        for plot in record["digests"]:
+            if plot in plots:
+                name, build = PLOTS[plot]
+                plot_files.extend(
+                    save_variants(lambda build=build, plot=plot: build(frames()[plot]), name, variants, record["digests"][plot])
+                )
     
     # Summary
     print()
     print("=== Plot Generation Complete ===")
     print(f"Files created:")
-    print(f"  - {plot_file}")
-    print(f"  - {plot_file_hires}")
+    for file in plot_files:
+        print(f"  - {file}")
     print()
-    print(f"Total releases visualized: {len(df)}")
+    print(f"Total releases visualized: {record['total']}")
+    stable = record["latest_stable"]
+    if stable:
+        print(f"Latest stable release: {stable['tag']} ({stable['date']}, {stable['count']} in total)")
     print("Ready for presentation!")
+    return plot_files
+
+def watch(args, interval=0.2):
+    """Re-render the plots whenever their data or plotting code changes (--watch).
+
+    This process stays alive with matplotlib and numpy imported, so
+    a change costs a render instead of a cold start, and only the standard
+    resolution is re-rendered (WATCH_DPIS) to keep the loop short; a normal
+    run writes the high resolution files again. Edited modules (this
+    script included) are reloaded with importlib.reload; a changed
+    assets.txt only re-renders the asset plot, anything else both plots
+    (whose unchanged variants the build cache skips, see build_cache.py).
+    """
+    import importlib
+    import time
+    import traceback
+    
+    script_dir = Path(__file__).parent
+    build_dir = script_dir / "build"
+    data_file = release_db.default_db_file() if args.db else build_dir / "releases.txt"
+    watched = {data_file: ("timeline", "assets")}
+    if args.assets:
+        watched[build_dir / "assets.txt"] = ("assets",)
+    code_files = {script_dir / f"{name}.py": name for name in WATCHED_MODULES}
+    watched.update(dict.fromkeys(code_files, ("timeline", "assets")))
+    
+    def mtimes():
+        return {path: path.stat().st_mtime_ns if path.exists() else None for path in watched}
+    
+    # An importable copy of this script: __main__ cannot be reloaded
+    module = importlib.import_module(Path(__file__).stem)
+    seen = mtimes()
+    print()
+    print(f"Watching {len(watched)} files for changes (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(interval)
+            current = mtimes()
+            changed = [path for path in watched if current[path] != seen[path]]
+            if not changed:
+                continue
+            seen = current
+            print()
+            print(f"Changed: {', '.join(path.name for path in changed)}")
+            start = time.perf_counter()
+            try:
+                if any(path in code_files for path in changed):
+                    # Reload in dependency order, so this script binds the new definitions
+                    for name in WATCHED_MODULES:
+                        if name in sys.modules:
+                            importlib.reload(sys.modules[name])
+                    module = sys.modules[Path(__file__).stem]
+                plots = {plot for path in changed for plot in watched[path]}
+                module.generate(args, tuple(plots), WATCH_DPIS)
+            except (Exception, SystemExit):
+                traceback.print_exc()  # Keep watching: the next edit may fix it
+            print(f"Re-rendered in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+    generate(args)
+    if args.watch:
+        watch(args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
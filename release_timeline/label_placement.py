@@ -0,0 +1,92 @@
+"""
+Label Placement
+
+Places point labels (e.g. release versions on the timeline) without
+overlaps. Labels are tried in priority order at a few candidate positions
+around their point (right above, left above, right below, left below); a
+label is placed at the first candidate that stays inside the plot area and
+overlaps neither an obstacle (legend, text boxes, markers) nor a label placed
+before it, and dropped if none fits.
+
+Rectangles already placed are kept in a uniform grid, so checking a candidate
+only looks at its neighbourhood: placing n labels costs a sort plus O(n)
+grid lookups instead of comparing every pair. Labels of points closer than
+a point to each other compete for the same spot: only the first in priority
+order is tried, which keeps dense histories (thousands of points on a line)
+cheap.
+
+All coordinates are in points (1/72 inch) with y growing upwards, like
+matplotlib's display coordinates; rectangles are (x0, y0, x1, y1).
+"""
+
+import math
+from collections import defaultdict
+
+# Candidate positions: direction of the label's offset from its point and the
+# matching text alignment (ha, va), tried in order
+CANDIDATES = [
+    ((1, 1), ("left", "bottom")),
+    ((-1, 1), ("right", "bottom")),
+    ((1, -1), ("left", "top")),
+    ((-1, -1), ("right", "top")),
+]
+
+
+class GridIndex:
+    """Uniform grid of rectangles answering "does this rectangle overlap any?"."""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+
+    def _cells(self, rect):
+        x0, y0, x1, y1 = (math.floor(v / self.cell_size) for v in rect)
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def overlaps(self, rect):
+        x0, y0, x1, y1 = rect
+        for cell in self._cells(rect):
+            for ox0, oy0, ox1, oy1 in self.cells.get(cell, ()):
+                if x0 < ox1 and ox0 < x1 and y0 < oy1 and oy0 < y1:
+                    return True
+        return False
+
+    def insert(self, rect):
+        for cell in self._cells(rect):
+            self.cells[cell].append(rect)
+
+
+def place_labels(anchors, sizes, priorities, bounds, obstacles=(), offset=5.0):
+    """Place as many labels as fit; returns one ((dx, dy), (ha, va)) or None per label.
+
+    anchors are the (x, y) points labelled, sizes the (width, height) of
+    each label's text and priorities sort keys (lowest placed first). A
+    placed label's text goes at (dx, dy) points from its anchor with the
+    given alignment. Labels must lie within bounds and clear of obstacles.
+    """
+    heights = sorted(height for _, height in sizes)
+    cell_size = max(2 * heights[len(heights) // 2], 1.0) if heights else 1.0  # ~2 label heights
+    index = GridIndex(cell_size)
+    for rect in obstacles:
+        index.insert(rect)
+
+    bx0, by0, bx1, by1 = bounds
+    placements = [None] * len(anchors)
+    tried = set()
+    for i in sorted(range(len(anchors)), key=priorities.__getitem__):
+        (x, y), (width, height) = anchors[i], sizes[i]
+        spot = (round(x), round(y))
+        if spot in tried:
+            continue  # A label of a point within a point of this one went first
+        tried.add(spot)
+        for (sx, sy), alignment in CANDIDATES:
+            dx, dy = sx * offset, sy * offset
+            left = x + dx if sx > 0 else x + dx - width
+            bottom = y + dy if sy > 0 else y + dy - height
+            rect = (left, bottom, left + width, bottom + height)
+            if rect[0] < bx0 or rect[1] < by0 or rect[2] > bx1 or rect[3] > by1 or index.overlaps(rect):
+                continue
+            index.insert(rect)
+            placements[i] = ((dx, dy), alignment)
+            break
+    return placements
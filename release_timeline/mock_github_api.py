@@ -0,0 +1,449 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# requires-python = ">=3.12"
+# dependencies = []
+# ///
+"""
+Mock GitHub API for Offline Fetch Testing and Benchmarks
+
+This script serves a small, deterministic subset of the GitHub API
+(organization repositories, paginated releases and weekly statistics over
+REST, and the releases query over GraphQL) from a local HTTP server, so fetch_release_data.py can be
+exercised and timed without network access.
+
+Usage:
+    ./mock_github_api.py serve [--port PORT] [--repos N] [--releases N] [--assets N] [--stats-delay SECONDS]
+    ./mock_github_api.py bench [--repos N] [--releases N] [--assets N] [--jobs N]
+    ./mock_github_api.py scale CASSETTE OUT --repo OWNER/NAME [--factor N]
+    ./mock_github_api.py gh api PATH [--paginate] [--include]
+    ./mock_github_api.py gh api graphql -f query=QUERY [-f KEY=VALUE ...]
+
+Commands:
+    serve    Run the mock API server until interrupted
+    bench    Start a mock server and time the fetch backends and APIs against it,
+             reporting requests made and bytes transferred
+    scale    Grow the releases of a repository recorded with
+             fetch_release_data.py --record into a synthetic history --factor
+             times as long, written as a new cassette for --replay
+    gh       Minimal stand-in for the gh CLI that talks to the mock server
+             (GITHUB_API_URL), for use as GH_CLI="./mock_github_api.py gh"
+
+The mock serves the organizations "mock-org" (and any other name) with
+--repos repositories each, every repository having --releases releases with
+--assets assets each. Releases embed at most 100 assets; the rest must be
+paged through the release's assets endpoint, which exercises the extra asset
+requests of fetch_release_data.py --assets. Like GitHub, the /stats/*
+endpoints answer 202 Accepted while "computing" (up to --stats-delay seconds
+after the first request, varying per repository and statistic), which
+exercises the polling of fetch_repo_stats.py.
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+DEFAULT_PER_PAGE = 30  # GitHub's default page size
+MAX_PER_PAGE = 100
+EMBEDDED_ASSETS = 100
+PREFIXES = ["", "pectra-devnet-6@", "fusaka-devnet-2@", "eip7692@", "benchmark@", "zkevm@"]
+STATS_WEEKS = 52
+STATS_AUTHORS = ["alice", "bob", "carol"]
+
+
+@functools.cache
+def make_releases(repo, count, assets=2):
+    """Generate count deterministic releases for repo, newest first.
+
+    Each release gets the given number of assets; the first EMBEDDED_ASSETS
+    are embedded in the release and all of them are kept under "all_assets".
+    """
+    start = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    releases = []
+    for i in range(count):
+        tag = f"{PREFIXES[i % len(PREFIXES)]}v{i // 10}.{i % 10}.0"
+        date = (start + timedelta(hours=13 * i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        releases.append({
+            "id": i + 1,
+            "tag_name": tag,
+            "name": f"{tag} release" if i % 3 == 0 else None,
+            "published_at": date,
+            "created_at": date,
+            "draft": False,
+            "prerelease": "@" in tag,
+            "author": {"login": "mock-bot", "id": 1, "type": "Bot"},
+            # Release notes and assets make up most of a real response
+            "body": f"## Changes in {tag}\n\n" + "- Fixed a test case.\n" * 60,
+            "all_assets": [
+                {
+                    "id": (i + 1) * 1000 + j,
+                    "name": f"fixtures_{j}.tar.gz",
+                    "size": 40_000_000 + 150_000 * i + j,
+                    "download_count": 3 * i + j,
+                    "content_type": "application/gzip",
+                    "created_at": date,
+                }
+                for j in range(assets)
+            ],
+            "html_url": f"https://github.com/{repo}/releases/tag/{tag}",
+        })
+        releases[-1]["assets"] = releases[-1]["all_assets"][:EMBEDDED_ASSETS]
+    releases.reverse()
+    return releases
+
+
+def make_stats(repo, stat):
+    """Generate deterministic weekly statistics of repo, oldest week first."""
+    seed = zlib.crc32(repo.encode())
+    start = int(datetime(2024, 6, 2, tzinfo=timezone.utc).timestamp())  # A Sunday, like GitHub's weeks
+    weeks = [start + week * 7 * 86400 for week in range(STATS_WEEKS)]
+    # Commits of each author in each week
+    commits = [[(seed + 7 * week + 13 * k) % (5 + 3 * k) for week in range(STATS_WEEKS)] for k in range(3)]
+    if stat == "commit_activity":
+        return [
+            {"days": [total // 7] * 6 + [total - 6 * (total // 7)], "total": total, "week": week}
+            for week, total in zip(weeks, map(sum, zip(*commits)))
+        ]
+    if stat == "code_frequency":
+        return [[week, 40 * sum(c), -15 * sum(c)] for week, c in zip(weeks, zip(*commits))]
+    if stat == "contributors":
+        return [
+            {
+                "author": {"login": author, "type": "User"},
+                "total": sum(commits[k]),
+                "weeks": [{"w": week, "a": 40 * c, "d": 15 * c, "c": c} for week, c in zip(weeks, commits[k])],
+            }
+            for k, author in enumerate(STATS_AUTHORS)
+        ]
+    return None
+
+
+def public_release(release):
+    """Drop the mock's bookkeeping fields from a release."""
+    return {key: value for key, value in release.items() if key != "all_assets"}
+
+
+class MockGitHubAPIHandler(BaseHTTPRequestHandler):
+    """Request handler serving organization repositories and releases."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    disable_nagle_algorithm = True  # Headers and body are written separately
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode()
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+            self.server.stats["bytes"] += len(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_page(self, url, items):
+        """Send one page of items with a GitHub-style Link header."""
+        query = urllib.parse.parse_qs(url.query)
+        per_page = min(int(query.get("per_page", [DEFAULT_PER_PAGE])[0]), MAX_PER_PAGE)
+        page = int(query.get("page", ["1"])[0])
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        for rel, number in (("next", page + 1), ("last", last)):
+            if page < last:
+                target = f"http://{self.headers['Host']}{url.path}?per_page={per_page}&page={number}"
+                links.append(f'<{target}>; rel="{rel}"')
+        headers = {"Link": ", ".join(links)} if links else {}
+        self.send_json(items[(page - 1) * per_page:page * per_page], headers=headers)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "orgs" and parts[2] == "repos":
+            repos = [{"full_name": f"{parts[1]}/repo{i:03d}"} for i in range(self.server.repos)]
+            self.send_page(url, repos)
+        elif len(parts) == 4 and parts[0] == "repos" and parts[3] == "releases":
+            releases = make_releases(f"{parts[1]}/{parts[2]}", self.server.releases, self.server.assets)
+            self.send_page(url, [public_release(release) for release in releases])
+        elif len(parts) == 6 and parts[0] == "repos" and parts[3] == "releases" and parts[5] == "assets":
+            releases = make_releases(f"{parts[1]}/{parts[2]}", self.server.releases, self.server.assets)
+            release = next((r for r in releases if str(r["id"]) == parts[4]), None)
+            if release is None:
+                self.send_json({"message": "Not Found"}, status=404)
+            else:
+                self.send_page(url, release["all_assets"])
+        elif len(parts) == 5 and parts[0] == "repos" and parts[3] == "stats":
+            repo = f"{parts[1]}/{parts[2]}"
+            stats = make_stats(repo, parts[4])
+            if stats is None:
+                self.send_json({"message": "Not Found"}, status=404)
+            elif self.computing_stats(repo, parts[4]):
+                self.send_json({}, status=202)
+            else:
+                self.send_json(stats)
+        else:
+            self.send_json({"message": "Not Found"}, status=404)
+
+    def computing_stats(self, repo, stat):
+        """Whether statistics are still being "computed" since their first request."""
+        delay = self.server.stats_delay * (zlib.crc32(f"{repo}/{stat}".encode()) % 100 + 1) / 100
+        with self.server.stats_lock:
+            started = self.server.stats_started.setdefault((repo, stat), time.monotonic())
+        return time.monotonic() - started < delay
+
+    def do_POST(self):
+        """Answer the releases query of fetch_release_data.RELEASES_QUERY."""
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.strip("/") != "graphql" or "releases(" not in request["query"]:
+            self.send_json({"errors": [{"message": "Unsupported query"}]})
+            return
+        variables = request.get("variables", {})
+        releases = make_releases(f"{variables['owner']}/{variables['name']}", self.server.releases, self.server.assets)
+        start = int(variables.get("cursor") or 0)
+        end = start + MAX_PER_PAGE
+        nodes = [
+            {"tagName": r["tag_name"], "publishedAt": r["published_at"], "name": r["name"]}
+            for r in releases[start:end]
+        ]
+        page_info = {"hasNextPage": end < len(releases), "endCursor": str(min(end, len(releases)))}
+        self.send_json({"data": {"repository": {"releases": {"nodes": nodes, "pageInfo": page_info}}}})
+
+
+def start_server(port=0, repos=10, releases=300, assets=2, stats_delay=0.0):
+    """Start a mock API server in a background thread; returns the server."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockGitHubAPIHandler)
+    server.daemon_threads = True
+    server.repos = repos
+    server.releases = releases
+    server.assets = assets
+    server.stats_delay = stats_delay
+    server.stats_started = {}
+    server.stats = {"requests": 0, "bytes": 0}
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def gh_stand_in(argv):
+    """Answer a `gh api ...` call from the mock server.
+
+    Like gh, a new process (and connection) is used per call, and paginated
+    pages are merged into one JSON array.
+    """
+    if argv[:1] != ["api"] or len(argv) < 2:
+        print("usage: mock_github_api.py gh api PATH [--paginate] [--include] [-f KEY=VALUE ...]", file=sys.stderr)
+        sys.exit(2)
+    api_url = os.environ.get("GITHUB_API_URL", "http://127.0.0.1:8000").rstrip("/")
+    url = f"{api_url}/{argv[1].lstrip('/')}"
+
+    if argv[1] == "graphql":
+        fields = dict(value.split("=", 1) for flag, value in zip(argv[2::2], argv[3::2]) if flag in ("-f", "-F"))
+        query = fields.pop("query")
+        body = json.dumps({"query": query, "variables": fields}).encode()
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            sys.stdout.write(response.read().decode())
+        return
+
+    items = []
+    while url:
+        with urllib.request.urlopen(url) as response:
+            if "--include" in argv or "-i" in argv:
+                sys.stdout.write(f"HTTP/1.1 {response.status} {response.reason}\n")
+                sys.stdout.writelines(f"{name}: {value}\n" for name, value in response.headers.items())
+                sys.stdout.write("\n" + response.read().decode())
+                return
+            page = json.load(response)
+            link = response.headers.get("Link") or ""
+        if "--paginate" not in argv:
+            json.dump(page, sys.stdout)
+            return
+        items.extend(page)
+        url = next((part.split(";")[0].strip(" <>") for part in link.split(",") if 'rel="next"' in part), None)
+    json.dump(items, sys.stdout)
+
+
+def scale_cassette(cassette_dir, out_dir, repo, factor):
+    """Write a cassette holding factor copies of repo's recorded release history.
+
+    Copy k of every release gets the tag suffix -synthetic.k (keeping its
+    prefix, so it falls in the same plot category) and is dated k history
+    spans earlier, so the synthetic history extends into the past. The new
+    cassette serves the REST listing (streamed and page by page) and the
+    GraphQL releases query.
+    """
+    sys.path.insert(0, str(Path(__file__).parent))
+    import fetch_release_data as fetch
+
+    backend = fetch.ReplayBackend(cassette_dir)
+    releases = list(backend.iter_items(f"repos/{repo}/releases?per_page={fetch.PER_PAGE}"))
+    dates = [
+        datetime.fromisoformat(release["published_at"].replace("Z", "+00:00"))
+        for release in releases if release["published_at"]
+    ]
+    if not dates:
+        print(f"Error: no published releases of {repo} in {cassette_dir}")
+        sys.exit(1)
+    span = max(dates) - min(dates) + timedelta(days=1)
+    max_id = max(release["id"] for release in releases)
+
+    scaled = []
+    for k in range(factor):
+        for release in releases:
+            release = dict(release)
+            if k:
+                tag = release["tag_name"]
+                release["id"] += k * max_id
+                release["tag_name"] = f"{tag}-synthetic.{k}"
+                if release.get("name"):
+                    release["name"] = release["name"].replace(tag, release["tag_name"])
+                for key in ("published_at", "created_at"):
+                    if release.get(key):
+                        date = datetime.fromisoformat(release[key].replace("Z", "+00:00")) - k * span
+                        release[key] = date.strftime("%Y-%m-%dT%H:%M:%SZ")
+            scaled.append(release)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    def save(method, target, body, payload, headers=None):
+        entry = {
+            "request": {"method": method, "target": target, "body": body},
+            "status": 200,
+            "reason": "OK",
+            "headers": headers or {},
+            "body": json.dumps(payload),
+        }
+        fetch.save_cassette_entry(out_dir, entry)
+
+    per_page = fetch.PER_PAGE
+    pages = [scaled[start:start + per_page] for start in range(0, len(scaled), per_page)]
+    listing = backend.target(f"repos/{repo}/releases?per_page={per_page}")
+    for number, page in enumerate(pages, 1):
+        headers = {}
+        if number < len(pages):
+            next_url = f"{backend.api_url.scheme}://{backend.api_url.netloc}{listing}&page={number + 1}"
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        save("GET", f"{listing}&page={number}", None, page, headers)
+        if number == 1:
+            save("GET", listing, None, page, headers)
+
+    owner, name = repo.split("/")
+    cursor = None
+    for number, page in enumerate(pages, 1):
+        variables = {"owner": owner, "name": name, "cursor": cursor}
+        cursor = str(number * per_page)
+        nodes = [
+            {"tagName": release["tag_name"], "publishedAt": release["published_at"], "name": release["name"]}
+            for release in page
+        ]
+        page_info = {"hasNextPage": number < len(pages), "endCursor": cursor}
+        save(
+            "POST", backend.target("graphql"), json.dumps({"query": fetch.RELEASES_QUERY, "variables": variables}),
+            {"data": {"repository": {"releases": {"nodes": nodes, "pageInfo": page_info}}}},
+        )
+
+    print(f"Scaled {len(releases)} recorded releases of {repo} to {len(scaled)} in {out_dir}")
+
+
+def bench(repos, releases, assets, jobs):
+    """Time fetch_release_data.py backends and APIs against a local mock server."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    import fetch_release_data as fetch
+
+    server = start_server(repos=repos, releases=releases, assets=assets)
+    api_url = f"http://127.0.0.1:{server.server_port}"
+    os.environ["GITHUB_API_URL"] = api_url
+    fetch.GH_CLI = f"{sys.executable} {Path(__file__).resolve()} gh"
+    repo_names = [f"mock-org/repo{i:03d}" for i in range(repos)]
+
+    print(f"Mock API at {api_url}: {repos} repos x {releases} releases")
+    print()
+    print(f"{'backend':<10}{'API':<10}{'sequential':>12}{f'{jobs} jobs':>12}{'requests':>10}{'bytes':>14}")
+
+    rows = {}
+    for backend in (fetch.GhBackend(), fetch.HttpBackend(api_url)):
+        for graphql in (False, True):
+            def fetch_repo(repo):
+                return [fetch.release_to_line(release) for release in fetch.iter_releases(backend, repo, graphql)]
+
+            server.stats.update(requests=0, bytes=0)
+            start = time.perf_counter()
+            rows[backend.name, graphql] = [fetch_repo(repo) for repo in repo_names]
+            sequential = time.perf_counter() - start
+            stats = dict(server.stats)
+
+            start = time.perf_counter()
+            with fetch.ThreadPoolExecutor(max_workers=jobs) as pool:
+                list(pool.map(fetch_repo, repo_names))
+            concurrent = time.perf_counter() - start
+
+            api = "GraphQL" if graphql else "REST"
+            print(
+                f"{backend.name:<10}{api:<10}{sequential:>11.3f}s{concurrent:>11.3f}s"
+                f"{stats['requests']:>10}{stats['bytes']:>14,}"
+            )
+
+    server.shutdown()
+    print()
+    if all(result == rows["gh", False] for result in rows.values()):
+        print("All backends and APIs produced identical releases.txt rows")
+    else:
+        print("Error: backends or APIs produced different releases.txt rows")
+        sys.exit(1)
+
+
+def main():
+    """Main execution function."""
+    if sys.argv[1:2] == ["gh"]:
+        gh_stand_in(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="Mock GitHub API for offline fetch testing and benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Run the mock API server")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    serve_parser.add_argument(
+        "--stats-delay", type=float, default=10.0, help="Longest time statistics are computed (default: 10s)"
+    )
+    bench_parser = subparsers.add_parser("bench", help="Time the fetch backends against a mock server")
+    bench_parser.add_argument("--jobs", type=int, default=8, help="Concurrent fetches in the parallel run")
+    for sub in (serve_parser, bench_parser):
+        sub.add_argument("--repos", type=int, default=10, help="Repositories per organization (default: 10)")
+        sub.add_argument("--releases", type=int, default=300, help="Releases per repository (default: 300)")
+        sub.add_argument("--assets", type=int, default=2, help="Assets per release (default: 2)")
+    scale_parser = subparsers.add_parser("scale", help="Grow a recorded release history into a synthetic one")
+    scale_parser.add_argument("cassette", type=Path, help="Cassette recorded with fetch_release_data.py --record")
+    scale_parser.add_argument("out", type=Path, help="Directory to write the scaled cassette to")
+    scale_parser.add_argument("--repo", required=True, help="Repository whose releases to scale")
+    scale_parser.add_argument("--factor", type=int, default=10, help="History length multiplier (default: 10)")
+    subparsers.add_parser("gh", help="gh CLI stand-in: gh api PATH [--paginate] [-f KEY=VALUE ...]")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = start_server(args.port, args.repos, args.releases, args.assets, args.stats_delay)
+        print(f"Mock GitHub API listening on http://127.0.0.1:{server.server_port} (Ctrl-C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif args.command == "bench":
+        bench(args.repos, args.releases, args.assets, args.jobs)
+    elif args.command == "scale":
+        scale_cassette(args.cassette, args.out, args.repo, args.factor)
+
+
+if __name__ == "__main__":
+    main()
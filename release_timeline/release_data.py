@@ -0,0 +1,231 @@
+"""
+Release Data Layer
+
+Shared parsing of releases.txt (tag|date|name lines, newest first) for
+fetch_release_data.py, generate_plots.py and the release store and index.
+
+Rows are parsed once: parse_release_lines is the plain standard library
+parser (fetch_release_data.py has no dependencies), and load_release_table
+returns a whole file as a release table (with semantic version and plot
+label columns, see add_version_columns). The table is built from the
+columnar store (see release_store.py) when it is up to date; otherwise the
+text is parsed and the table kept as an Arrow file in build/cache/ keyed by
+the SHA-256 of the input, so repeated plot runs skip parsing entirely.
+
+A release table is a dict of equally long NumPy columns, like the team
+timeline's datasets: dates are datetime64[s] (UTC), strings are NumPy
+unicode arrays and integers int64. The datasets are small, so there is no
+pandas: tables from the store only need NumPy, the text parse and the cache
+also pyarrow. Both are only imported when used.
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from pathlib import Path
+
+CACHE_VERSION = 3  # Bump when the table columns or the parsing of releases.txt change
+TABLE_COLUMNS = ["tag", "date", "name", "prefix", "version", "major", "minor", "patch", "pre", "label"]
+SEMVER_PATTERN = r"(?a)^v?(?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?(?:-(?P<pre>[0-9A-Za-z.-]+))?"
+
+
+def file_sha256(path):
+    """Hash a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def split_tag(tag):
+    """Split a release tag into (prefix, version); untagged releases are "stable"."""
+    if "@" in tag:
+        prefix, version = tag.split("@")[:2]
+        return prefix, version
+    return "stable", tag
+
+
+def datetime64(value):
+    """Convert a timezone-aware datetime to a table date (datetime64[s], UTC)."""
+    import numpy as np
+
+    return np.datetime64(int(value.timestamp()), "s")
+
+
+def take(table, rows):
+    """Return the rows of a release table (an index, slice or boolean mask) as a new table."""
+    return {name: column[rows] for name, column in table.items()}
+
+
+def table_from_rows(rows):
+    """Build a release table from (tag, published_at, name, prefix, version) rows (epoch seconds)."""
+    import numpy as np
+
+    tag, published_at, name, prefix, version = zip(*rows) if rows else ((),) * 5
+    return {
+        "tag": np.array(tag, dtype=str),
+        "date": np.array(published_at, dtype=np.int64).astype("datetime64[s]"),
+        "name": np.array(name, dtype=str),
+        "prefix": np.array(prefix, dtype=str),
+        "version": np.array(version, dtype=str),
+    }
+
+
+def parse_release_lines(release_lines):
+    """Yield (tag, date, name) of each published release in tag|date|name lines.
+
+    date is a timezone-aware datetime. Names may contain "|": only the first
+    two separate fields. Drafts (no publish date) and malformed lines are
+    skipped.
+    """
+    for line in release_lines:
+        parts = line.strip().split("|", 2)
+        if len(parts) == 3 and parts[1] != "None":
+            yield parts[0], datetime.fromisoformat(parts[1].replace("Z", "+00:00")), parts[2]
+
+
+def strings(array):
+    """Convert an Arrow string array to a NumPy unicode column."""
+    import numpy as np
+
+    return np.asarray(array.to_numpy(zero_copy_only=False), dtype=str)
+
+
+def read_release_table(releases_file):
+    """Parse releases_file into a release table sorted by date, column by column.
+
+    The file is split into lines and fields by Arrow compute kernels, and
+    dates, prefixes and versions are computed on whole columns instead of
+    line by line. Fields are split like parse_release_lines: on the first
+    two "|", so names may contain "|". Drafts (no publish date) and
+    malformed lines are dropped.
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    text = pa.array([Path(releases_file).read_text()], pa.large_string())
+    lines = pc.utf8_trim_whitespace(pc.list_flatten(pc.split_pattern(text, "\n")))
+    fields = pc.split_pattern(lines, "|", max_splits=2)
+    fields = fields.filter(pc.equal(pc.list_value_length(fields), 3))
+    table = pa.table({
+        column: pc.list_element(fields, index).cast(pa.string()) for index, column in enumerate(["tag", "date", "name"])
+    })
+    table = table.filter(pc.invert(pc.is_in(table["date"], pa.array(["", "None"]))))
+
+    # Unix epoch seconds, like the columnar store
+    seconds = pc.strptime(table["date"], format="%Y-%m-%dT%H:%M:%SZ", unit="s").cast(pa.int64())
+
+    # Categorize releases: prefix@version, stable releases have no prefix
+    tag = table["tag"]
+    qualified = pc.if_else(pc.match_substring(tag, "@"), tag, pc.binary_join_element_wise("stable", tag, "@"))
+    parts = pc.split_pattern(qualified, "@")
+    df = {
+        "tag": strings(tag),
+        "date": seconds.to_numpy().astype("datetime64[s]"),
+        "name": strings(table["name"]),
+        "prefix": strings(pc.list_element(parts, 0)),
+        "version": strings(pc.list_element(parts, 1)),
+    }
+    return add_version_columns(take(df, np.argsort(df["date"], kind="stable")))
+
+
+def add_version_columns(df):
+    """Add semantic version and plot label columns, computed on whole columns.
+
+    major/minor/patch are integers (-1 if the version is not numeric) and
+    pre is the pre-release part, e.g. "rc.1". label is the version without
+    "v", prefixed by the devnet number for devnet releases (e.g. "6@1.2.0"
+    for pectra-devnet-6@v1.2.0). Returns a new table.
+
+    Versions and prefixes repeat, so each distinct one is parsed once and the
+    releases take their values by index.
+    """
+    import re
+
+    import numpy as np
+
+    semver = re.compile(SEMVER_PATTERN)
+    versions, version_codes = np.unique(df["version"], return_inverse=True)
+    numbers = np.full((len(versions), 3), -1, dtype=np.int64)
+    pre = []
+    for i, version in enumerate(versions):
+        match = semver.match(version)
+        for j, digits in enumerate(match.group("major", "minor", "patch") if match else ()):
+            if digits:
+                numbers[i, j] = int(digits)
+        pre.append(match["pre"] or "" if match else "")
+    texts = [version.replace("v", "") for version in versions]
+
+    # Devnet prefixes (containing "devnet" and "-") put their number before the version
+    prefixes, prefix_codes = np.unique(df["prefix"], return_inverse=True)
+    devnet_ids = [
+        f"{prefix.rsplit('-', 1)[1]}@" if "devnet" in prefix and "-" in prefix else "" for prefix in prefixes
+    ]
+    label = np.char.add(np.array(devnet_ids, dtype=str)[prefix_codes], np.array(texts, dtype=str)[version_codes])
+    return {
+        **df,
+        "major": numbers[version_codes, 0],
+        "minor": numbers[version_codes, 1],
+        "patch": numbers[version_codes, 2],
+        "pre": np.array(pre, dtype=str)[version_codes],
+        "label": label,
+    }
+
+
+def cache_file_for(releases_file, sha256):
+    """Return the table cache file of releases_file with the given content hash."""
+    releases_file = Path(releases_file)
+    return releases_file.parent / "cache" / f"{releases_file.stem}-v{CACHE_VERSION}-{sha256[:16]}.arrow"
+
+
+def save_table_cache(df, cache_file):
+    """Atomically write a release table to an Arrow file, replacing older caches of the same input."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    cache_file.parent.mkdir(exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")  # Parallel plot runs share the cache
+    feather.write_feather(pa.table({name: pa.array(column) for name, column in df.items()}), tmp_file)
+    tmp_file.replace(cache_file)
+    stem = cache_file.name.split("-v")[0]
+    for stale in cache_file.parent.glob(f"{stem}-v*.arrow"):
+        if stale != cache_file:
+            stale.unlink(missing_ok=True)
+
+
+def load_release_table(releases_file, since=None, until=None):
+    """Return the releases of releases_file published in [since, until), sorted by date.
+
+    since and until are timezone-aware datetimes (or None for open ends). The
+    table is built from the up-to-date columnar store (see release_store.py),
+    converting only the rows of the window, with NumPy alone. Without a
+    store, the parsed table comes from the cache when releases_file is
+    unchanged; otherwise it is parsed from the text, and cached.
+    """
+    import numpy as np
+    from release_store import load_release_store
+
+    store = load_release_store(releases_file)
+    if store is not None:
+        # Rows are sorted by date, so the window is a binary search on the mapped dates
+        df = add_version_columns(store.to_table(store.date_range(since, until)))
+        window = f" of {store.rows}" if since is not None or until is not None else ""
+        print(f"Loaded {len(df['date'])}{window} releases from {store.store_dir}")
+        return df
+
+    import pyarrow.feather as feather
+
+    cache_file = cache_file_for(releases_file, file_sha256(releases_file))
+    if cache_file.exists():
+        table = feather.read_table(cache_file)
+        df = {name: table[name].to_numpy() for name in TABLE_COLUMNS}
+        df.update({name: strings(table[name]) for name in TABLE_COLUMNS if df[name].dtype == object})
+        print(f"Loaded {len(df['date'])} releases from cache {cache_file}")
+    else:
+        df = read_release_table(releases_file)
+        print(f"Read {len(df['date'])} releases from {releases_file}")
+        save_table_cache({name: df[name] for name in TABLE_COLUMNS}, cache_file)
+
+    # Rows are sorted by date, so the window is a binary search away
+    start = 0 if since is None else int(np.searchsorted(df["date"], datetime64(since), "left"))
+    end = len(df["date"]) if until is None else int(np.searchsorted(df["date"], datetime64(until), "left"))
+    return take(df, slice(start, max(start, end)))
@@ -0,0 +1,202 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# requires-python = ">=3.12"
+# dependencies = []
+# ///
+"""
+SQLite Release Index
+
+Releases of any number of repositories are upserted into build/releases.sqlite
+(keyed by repo and tag, indexed by prefix and publish date), so the plot stage
+and ad-hoc questions can query exactly the rows they need.
+
+Usage:
+    ./release_db.py latest [--repo OWNER/NAME]
+    ./release_db.py cumulative [--repo OWNER/NAME] [--since YYYY-MM-DD] [--until YYYY-MM-DD]
+
+Commands:
+    latest        Latest release per prefix (across all repositories by default)
+    cumulative    Cumulative release count per prefix over time
+
+Requirements:
+    - releases.sqlite (generated by fetch_release_data.py --db)
+"""
+
+import argparse
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from release_data import parse_release_lines, split_tag
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS releases (
+    repo TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    published_at INTEGER NOT NULL,  -- Unix epoch seconds
+    name TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    version TEXT NOT NULL,
+    PRIMARY KEY (repo, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS releases_prefix_published_at ON releases (prefix, published_at);
+CREATE INDEX IF NOT EXISTS releases_published_at ON releases (published_at);
+"""
+
+
+def default_db_file():
+    """Return the default database location, build/releases.sqlite."""
+    return Path(__file__).parent / "build" / "releases.sqlite"
+
+
+def connect(db_file=None):
+    """Open (and create if needed) the release database."""
+    db_file = Path(db_file or default_db_file())
+    db_file.parent.mkdir(exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def date_window(since=None, until=None, column="published_at"):
+    """Build the SQL condition and parameters selecting [since, until)."""
+    conditions, params = [], []
+    if since is not None:
+        conditions.append(f"{column} >= ?")
+        params.append(int(since.timestamp()))
+    if until is not None:
+        conditions.append(f"{column} < ?")
+        params.append(int(until.timestamp()))
+    return " AND ".join(conditions) or "1", params
+
+
+def upsert_releases(conn, repo, release_lines):
+    """Insert or update tag|date|name lines of repo; returns the row count."""
+    rows = [
+        (repo, tag, int(date.timestamp()), name, *split_tag(tag))
+        for tag, date, name in parse_release_lines(release_lines)
+    ]
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO releases (repo, tag, published_at, name, prefix, version)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (repo, tag) DO UPDATE SET
+                published_at = excluded.published_at,
+                name = excluded.name
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+def export_release_lines(conn, repo):
+    """Return the tag|date|name lines of repo, newest first."""
+    cursor = conn.execute(
+        "SELECT tag, published_at, name FROM releases WHERE repo = ? ORDER BY published_at DESC, tag DESC",
+        (repo,),
+    )
+    return [
+        f"{tag}|{datetime.fromtimestamp(published_at, timezone.utc):%Y-%m-%dT%H:%M:%SZ}|{name}"
+        for tag, published_at, name in cursor
+    ]
+
+
+def query_releases(conn, repo, since=None, until=None):
+    """Return (tag, published_at, name, prefix, version) rows of repo in [since, until)."""
+    window, params = date_window(since, until)
+    return conn.execute(
+        f"""
+        SELECT tag, published_at, name, prefix, version FROM releases
+        WHERE repo = ? AND {window}
+        ORDER BY published_at
+        """,
+        (repo, *params),
+    ).fetchall()
+
+
+def cumulative_counts(conn, repo, since=None, until=None, category_of=None):
+    """Return (category, published_at, cumulative count) rows of repo in [since, until).
+
+    category_of maps a prefix to its category (or None to leave it out);
+    by default every prefix is its own category. Counts start at the
+    beginning of the history, so a window shows the running totals.
+    """
+    prefixes = [row[0] for row in conn.execute("SELECT DISTINCT prefix FROM releases WHERE repo = ?", (repo,))]
+    mapping = [(prefix, category_of(prefix) if category_of else prefix) for prefix in prefixes]
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS categories (prefix TEXT PRIMARY KEY, category TEXT)")
+    with conn:
+        conn.execute("DELETE FROM temp.categories")
+        conn.executemany("INSERT INTO temp.categories VALUES (?, ?)", [m for m in mapping if m[1] is not None])
+    # Rows before the window still count towards the running totals
+    until_window, until_params = date_window(until=until, column="r.published_at")
+    since_window, since_params = date_window(since=since)
+    return conn.execute(
+        f"""
+        SELECT category, published_at, cumulative FROM (
+            SELECT c.category, r.published_at,
+                   count(*) OVER (PARTITION BY c.category ORDER BY r.published_at, r.tag) AS cumulative
+            FROM releases r JOIN temp.categories c ON c.prefix = r.prefix
+            WHERE r.repo = ? AND {until_window}
+        )
+        WHERE {since_window}
+        ORDER BY category, published_at
+        """,
+        (repo, *until_params, *since_params),
+    ).fetchall()
+
+
+def latest_per_prefix(conn, repo=None):
+    """Return (repo, prefix, tag, published_at, count) of the latest release per prefix."""
+    # SQLite takes the bare tag column from the row holding max(published_at)
+    return conn.execute(
+        f"""
+        SELECT repo, prefix, tag, max(published_at), count(*) FROM releases
+        WHERE {"repo = ?" if repo else "1"}
+        GROUP BY repo, prefix
+        ORDER BY repo, max(published_at) DESC
+        """,
+        (repo,) if repo else (),
+    ).fetchall()
+
+
+def parse_date_arg(value):
+    """Parse a YYYY-MM-DD command line date as midnight UTC."""
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def format_date(published_at):
+    return datetime.fromtimestamp(published_at, timezone.utc).strftime("%Y-%m-%d")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Query the SQLite release index")
+    parser.add_argument("--db", type=Path, default=default_db_file(), help="Database file (default: build/releases.sqlite)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    latest_parser = subparsers.add_parser("latest", help="Latest release per prefix")
+    latest_parser.add_argument("--repo", help="Only this repository (default: all)")
+    cumulative_parser = subparsers.add_parser("cumulative", help="Cumulative release count per prefix")
+    cumulative_parser.add_argument("--repo", default="ethereum/execution-spec-tests", help="Repository")
+    cumulative_parser.add_argument("--since", type=parse_date_arg, help="First date (YYYY-MM-DD)")
+    cumulative_parser.add_argument("--until", type=parse_date_arg, help="End date, exclusive (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Error: {args.db} not found!")
+        print("Please run 'uv run release_timeline/fetch_release_data.py --db' first.")
+        sys.exit(1)
+    conn = connect(args.db)
+
+    if args.command == "latest":
+        for repo, prefix, tag, published_at, count in latest_per_prefix(conn, args.repo):
+            print(f"{repo:40} {prefix:24} {tag:40} {format_date(published_at)} ({count} releases)")
+    else:
+        for category, published_at, cumulative in cumulative_counts(conn, args.repo, args.since, args.until):
+            print(f"{category:24} {format_date(published_at)} {cumulative:6}")
+
+
+if __name__ == "__main__":
+    main()
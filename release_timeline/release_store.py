@@ -0,0 +1,173 @@
+"""
+Columnar Release Store
+
+A compact binary copy of releases.txt that the plot stage can memory-map
+instead of parsing text. The store is a directory next to releases.txt:
+
+    releases.cols/
+        meta.json        row count, prefix dictionary, SHA-256 of releases.txt
+        published_at.i8  int64 epoch seconds, sorted ascending
+        prefix.u2        uint16 codes into the prefix dictionary
+        tag.u4           uint32 indices into the string table
+        version.u4       uint32 indices into the string table
+        name.u4          uint32 indices into the string table
+        strings.off      int64 byte offsets of each interned string (+ end)
+        strings.utf8     interned strings, UTF-8 encoded back to back
+
+All columns are little-endian, so they can be opened with numpy.memmap.
+Because rows are sorted by date, a date range is a binary search away.
+
+Writing only needs the standard library (fetch_release_data.py has no
+dependencies); reading needs numpy.
+"""
+
+import json
+import sys
+from array import array
+from pathlib import Path
+
+from release_data import file_sha256, parse_release_lines, split_tag
+
+STORE_VERSION = 2  # Bump when the columns or the parsing of releases.txt change
+
+# File name -> (array typecode, numpy dtype)
+COLUMNS = {
+    "published_at.i8": ("q", "<i8"),
+    "prefix.u2": ("H", "<u2"),
+    "tag.u4": ("I", "<u4"),
+    "version.u4": ("I", "<u4"),
+    "name.u4": ("I", "<u4"),
+    "strings.off": ("q", "<i8"),
+}
+ATTRIBUTES = {name: name.split(".")[0] for name in COLUMNS} | {"strings.off": "string_offsets"}
+
+
+def store_dir_for(releases_file):
+    """Return the store directory belonging to a releases.txt file."""
+    return Path(releases_file).with_suffix(".cols")
+
+
+def write_release_store(releases_file):
+    """Build the columnar store for releases_file; returns the store directory."""
+    releases_file = Path(releases_file)
+    store_dir = store_dir_for(releases_file)
+    store_dir.mkdir(exist_ok=True)
+
+    with open(releases_file, "r") as f:
+        rows = [(int(date.timestamp()), tag, name) for tag, date, name in parse_release_lines(f)]
+    rows.sort(key=lambda row: row[0])
+
+    prefixes = sorted({split_tag(tag)[0] for _, tag, _ in rows})
+    prefix_codes = {prefix: code for code, prefix in enumerate(prefixes)}
+    interned = {}
+
+    def intern(string):
+        return interned.setdefault(string, len(interned))
+
+    columns = {name: array(typecode) for name, (typecode, _) in COLUMNS.items()}
+    for timestamp, tag, name in rows:
+        prefix, version = split_tag(tag)
+        columns["published_at.i8"].append(timestamp)
+        columns["prefix.u2"].append(prefix_codes[prefix])
+        columns["tag.u4"].append(intern(tag))
+        columns["version.u4"].append(intern(version))
+        columns["name.u4"].append(intern(name))
+
+    pool = bytearray()
+    for string in interned:
+        columns["strings.off"].append(len(pool))
+        pool += string.encode()
+    columns["strings.off"].append(len(pool))
+
+    for name, values in columns.items():
+        assert values.itemsize == int(COLUMNS[name][1][-1])
+        if sys.byteorder == "big":
+            values.byteswap()
+        write_atomically(store_dir / name, values.tobytes())
+    write_atomically(store_dir / "strings.utf8", bytes(pool))
+
+    # Written last: a reader only trusts the columns if this matches releases.txt
+    meta = {
+        "version": STORE_VERSION,
+        "rows": len(rows),
+        "strings": len(interned),
+        "prefixes": prefixes,
+        "source_sha256": file_sha256(releases_file),
+    }
+    write_atomically(store_dir / "meta.json", json.dumps(meta, indent=2).encode())
+    return store_dir
+
+
+def write_atomically(path, data):
+    """Replace path with data without leaving a partial file behind."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+class ReleaseStore:
+    """Memory-mapped columns of a release store."""
+
+    def __init__(self, store_dir, meta):
+        import numpy as np
+
+        self.store_dir = Path(store_dir)
+        self.rows = meta["rows"]
+        self.prefixes = np.array(meta["prefixes"], dtype=object)
+        self._strings = None
+        for name, (_, dtype) in COLUMNS.items():
+            length = meta["strings"] + 1 if name == "strings.off" else self.rows
+            if length:
+                column = np.memmap(self.store_dir / name, dtype=dtype, mode="r", shape=(length,))
+            else:
+                column = np.empty(0, dtype=dtype)  # numpy cannot map empty files
+            setattr(self, ATTRIBUTES[name], column)
+
+    @property
+    def strings(self):
+        """The interned string table, decoded on first use."""
+        if self._strings is None:
+            import numpy as np
+
+            pool = (self.store_dir / "strings.utf8").read_bytes()
+            bounds = self.string_offsets.tolist()
+            self._strings = np.array(
+                [pool[start:end].decode() for start, end in zip(bounds[:-1], bounds[1:])], dtype=object
+            )
+        return self._strings
+
+    def date_range(self, start=None, end=None):
+        """Return the row slice of releases published in [start, end).
+
+        start and end are timezone-aware datetimes (or None for open ends);
+        the lookup is a binary search on the sorted publish dates.
+        """
+        import numpy as np
+
+        lo = 0 if start is None else int(np.searchsorted(self.published_at, int(start.timestamp()), "left"))
+        hi = self.rows if end is None else int(np.searchsorted(self.published_at, int(end.timestamp()), "left"))
+        return slice(lo, max(lo, hi))
+
+    def to_table(self, rows=slice(None)):
+        """Build the release table columns (see release_data.py) of a row slice."""
+        strings = self.strings
+        return {
+            "tag": strings[self.tag[rows]].astype(str),
+            "date": self.published_at[rows].astype("datetime64[s]"),
+            "name": strings[self.name[rows]].astype(str),
+            "prefix": self.prefixes[self.prefix[rows]].astype(str),
+            "version": strings[self.version[rows]].astype(str),
+        }
+
+
+def load_release_store(releases_file):
+    """Open the store of releases_file, or return None if it is missing or stale."""
+    store_dir = store_dir_for(releases_file)
+    meta_file = store_dir / "meta.json"
+    if not meta_file.exists():
+        return None
+    with open(meta_file, "r") as f:
+        meta = json.load(f)
+    if meta.get("version") != STORE_VERSION or meta["source_sha256"] != file_sha256(releases_file):
+        return None
+    return ReleaseStore(store_dir, meta)
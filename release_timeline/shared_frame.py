@@ -0,0 +1,73 @@
+"""
+Shared Frames
+
+Hands the columns of a release table (see release_data.py) to worker
+processes through a single multiprocessing.shared_memory block instead of
+pickling the table to each of them. Every column is a flat NumPy array of a
+fixed-size type (datetime64, integers, bools or unicode strings), stored
+back to back as it is.
+
+share_frame returns the block and a small picklable layout describing it;
+workers map the block and use the table with attach_frame, whose columns are
+read-only views of the block, so workers do not copy the data. The creator
+closes and unlinks the block once the workers are done.
+"""
+
+import gc
+from multiprocessing import shared_memory
+
+ALIGNMENT = 8
+
+
+def array_at(buffer, offset, rows, dtype, writeable=True):
+    """View rows values of dtype in buffer at offset as a flat numpy array."""
+    import numpy as np
+
+    array = np.ndarray((rows,), np.dtype(dtype), buffer, offset)
+    array.flags.writeable = writeable
+    return array
+
+
+def share_frame(df, columns):
+    """Copy the columns of the table df into a new shared memory block; returns (block, layout)."""
+    import numpy as np
+
+    arrays = {name: np.ascontiguousarray(df[name]) for name in columns}
+    size = 0
+    placed = []
+    for name, array in arrays.items():
+        if array.dtype.kind not in "bifuMU":
+            raise TypeError(f"Cannot share column {name!r} of type {array.dtype}")
+        placed.append((name, size, array.dtype.str))
+        size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    rows = len(df[columns[0]])
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for name, offset, dtype in placed:
+        array_at(block.buf, offset, rows, dtype)[...] = arrays[name]
+    return block, {"block": block.name, "rows": rows, "columns": placed}
+
+
+def attach_frame(layout, use):
+    """Call use(frame) with the table shared with share_frame; returns what use returns.
+
+    The columns of frame are read-only views of the shared block, which stays
+    mapped until use returns; frame must not be kept beyond that.
+    """
+    block = shared_memory.SharedMemory(name=layout["block"])
+    try:
+        return use(frame_from_buffer(block.buf, layout))
+    finally:
+        gc.collect()  # Figures are reference cycles and may still hold views of the block
+        try:
+            block.close()
+        except BufferError:
+            pass  # A view is still referenced; the mapping goes away with the worker process
+
+
+def frame_from_buffer(data, layout):
+    """Build the table described by layout on views of data, the shared block."""
+    return {
+        name: array_at(data, offset, layout["rows"], dtype, writeable=False)
+        for name, offset, dtype in layout["columns"]
+    }
@@ -0,0 +1,49 @@
+"""Decimating the release lines keeps a marker on every release."""
+
+import io
+import re
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+
+from generate_plots import apply_theme, build_timeline, categorize_releases, get_theme_config
+from release_data import add_version_columns, table_from_rows
+
+RELEASES = 20000
+
+
+def dense_releases():
+    """A year of releases, far more than the plot has pixel columns."""
+    start = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+    step = 365 * 86400 // RELEASES
+    rows = [
+        (f"v{i // 100}.{i % 100}.0", start + i * step, f"Release {i}", "stable", f"v{i // 100}.{i % 100}.0")
+        for i in range(RELEASES)
+    ]
+    df = add_version_columns(table_from_rows(rows))
+    df["category"] = categorize_releases(df["prefix"])
+    return df
+
+
+def drawn_markers(model):
+    """Count the release markers the figure draws, legend entry included."""
+    svg = io.StringIO()
+    model["fig"].savefig(svg, format="svg")
+    # Markers are uses of a marker path (ids m<hex>); the release markers share
+    # one, while tick marks have their own and text glyphs are other uses
+    uses = Counter(re.findall(r'<use xlink:href="#(m[0-9a-f]+)"', svg.getvalue()))
+    return uses.most_common(1)[0][1]
+
+
+def test_decimation_keeps_every_marker():
+    model = build_timeline(dense_releases())
+    before = drawn_markers(model)
+    assert before == RELEASES + 1  # One per release and one in the legend
+
+    apply_theme(model, get_theme_config(dark_mode=True))
+    (line,) = model["lines"].values()
+    assert len(line.get_xdata()) < RELEASES  # The line itself was thinned out
+    assert drawn_markers(model) == before
+    assert len(model["markers"]["stable"].get_xdata()) == RELEASES
+    assert np.array_equal(line.get_xydata()[[0, -1]], model["series"]["stable"][[0, -1]])
@@ -0,0 +1,55 @@
+"""Every way of loading releases.txt returns the same releases."""
+
+from datetime import datetime, timezone
+
+import release_db
+from release_data import cache_file_for, file_sha256, load_release_table, parse_release_lines, read_release_table
+from release_store import store_dir_for, write_release_store
+
+RELEASES = """\
+v1.1.0|2024-02-01T12:00:00Z|Release | with a pipe
+fusaka-devnet-2@v1.0.0|2024-01-15T08:30:00Z|Devnet | release | two pipes
+v1.0.0|2024-01-01T00:00:00Z|Plain release
+v1.2.0|None|Draft | not published
+malformed line
+"""
+EXPECTED = [
+    ("v1.0.0", datetime(2024, 1, 1, tzinfo=timezone.utc), "Plain release"),
+    ("fusaka-devnet-2@v1.0.0", datetime(2024, 1, 15, 8, 30, tzinfo=timezone.utc), "Devnet | release | two pipes"),
+    ("v1.1.0", datetime(2024, 2, 1, 12, tzinfo=timezone.utc), "Release | with a pipe"),
+]
+
+
+def rows(df):
+    dates = [date.replace(tzinfo=timezone.utc) for date in df["date"].tolist()]
+    return list(zip(df["tag"].tolist(), dates, df["name"].tolist()))
+
+
+def test_names_with_pipes_load_alike(tmp_path):
+    releases_file = tmp_path / "releases.txt"
+    releases_file.write_text(RELEASES)
+
+    assert sorted(parse_release_lines(RELEASES.splitlines()), key=lambda row: row[1]) == EXPECTED
+    assert rows(read_release_table(releases_file)) == EXPECTED
+
+    # Text, then the table cache written by that load
+    assert rows(load_release_table(releases_file)) == EXPECTED
+    cache_file = cache_file_for(releases_file, file_sha256(releases_file))
+    assert cache_file.exists()
+    assert rows(load_release_table(releases_file)) == EXPECTED
+
+    # Columnar store (read before the cache), whole and windowed
+    write_release_store(releases_file)
+    assert store_dir_for(releases_file).exists()
+    assert rows(load_release_table(releases_file)) == EXPECTED
+    since = datetime(2024, 1, 10, tzinfo=timezone.utc)
+    assert rows(load_release_table(releases_file, since=since)) == EXPECTED[1:]
+
+    # SQLite index
+    conn = release_db.connect(tmp_path / "releases.sqlite")
+    assert release_db.upsert_releases(conn, "org/repo", RELEASES.splitlines()) == len(EXPECTED)
+    indexed = [
+        (tag, datetime.fromtimestamp(published_at, timezone.utc), name)
+        for tag, published_at, name, _, _ in release_db.query_releases(conn, "org/repo")
+    ]
+    assert indexed == EXPECTED
@@ -0,0 +1,324 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# requires-python = ">=3.12"
+# dependencies = [
+#     "matplotlib>=3.8.0",
+#     "numpy>=1.24.0",
+#     "pyarrow>=14.0.0",
+#     "pillow>=9.1.0"
+# ]
+# ///
+"""
+Render Server
+
+Serves the release and team timelines over HTTP for dashboards, rendered on
+demand from query parameters instead of read from files written by a cron
+job:
+
+    /timeline.png?theme=light&dpi=150&since=2024-01-01&until=2025-01-01&categories=stable,benchmark
+    /team.png?dpi=200
+
+theme is dark (default) or light, dpi the PNG resolution (default: 150 for
+the release timeline, 200 for the team timeline, at most 300), since/until
+restrict the releases to [since, until) like generate_plots.py, and
+categories (comma separated) selects the plotted categories.
+
+The datasets stay loaded in the process: the release table is re-read when
+releases.txt changes and the team timeline when team_timeline.py does. An
+image is identified by its parameters, the hash of its data and the plotting
+code; that identity is the ETag, so a request with a matching If-None-Match
+is answered 304 without rendering. Encoded images are kept in an LRU cache,
+so repeated dashboard loads are served from memory. Renders run one at a
+time (matplotlib is not thread-safe); cached images are served meanwhile.
+
+Usage:
+    ./render_server.py [--host HOST] [--port PORT] [--cache-size N] [--releases FILE]
+
+Options:
+    --host        Interface to listen on (default: 127.0.0.1)
+    --port        Port to listen on (default: 8050)
+    --cache-size  Encoded images kept in memory (default: 64)
+    --releases    Release data to serve (default: release_timeline/build/releases.txt)
+"""
+
+import argparse
+import importlib
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+ROOT = Path(__file__).parent
+sys.path[:0] = [str(ROOT / "release_timeline"), str(ROOT / "team_timeline")]
+
+import generate_plots  # noqa: E402
+import team_timeline  # noqa: E402
+from build_cache import render_key  # noqa: E402
+from figure_export import png_bytes  # noqa: E402
+from release_data import datetime64, file_sha256, take  # noqa: E402
+
+MIN_DPI = 50
+MAX_DPI = generate_plots.DECIMATION_DPI  # Lines are decimated for this resolution
+TIMELINE_DPI = 150
+THEMES = {"dark": True, "light": False}
+
+
+class LRUCache:
+    """Thread-safe mapping of the most recently used items, at most size of them."""
+
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.items:
+                return None
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+
+class Dataset:
+    """Data loaded from a file, loaded again when the file changes.
+
+    load(path) returns (digest, data): the digest identifies the data in
+    image keys. If loading the changed file fails, the previous data is kept.
+    """
+
+    def __init__(self, path, load):
+        self.path = path
+        self.load = load
+        self.stamp = None
+        self.loaded = None
+        self.lock = threading.Lock()
+
+    def current(self):
+        """Return (digest, data), loading the file if it changed since the last call."""
+        stat = self.path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self.stamp:
+            return self.loaded
+        with self.lock:
+            if stamp != self.stamp:
+                try:
+                    self.loaded = self.load(self.path)
+                    print(f"Loaded {self.path}")
+                except Exception:
+                    if self.loaded is None:
+                        raise
+                    traceback.print_exc()
+                    print(f"Keeping the previous data of {self.path}")
+                self.stamp = stamp
+        return self.loaded
+
+
+def load_releases(path):
+    """Parse the release table (with the projected release) of releases.txt."""
+    return file_sha256(path), generate_plots.parse_release_data(path)
+
+
+def load_team(path):
+    """(Re)load the team timeline script and build its datasets."""
+    module = importlib.reload(team_timeline)
+    df, team = module.build_dataset()
+    return module.input_digest(df, team), (module, df, team)
+
+
+class BadRequest(ValueError):
+    """Invalid query parameter, answered with 400."""
+
+
+def query_value(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+
+def parse_dpi(query, default):
+    value = query_value(query, "dpi", str(default))
+    if not value.isdigit() or not MIN_DPI <= int(value) <= MAX_DPI:
+        raise BadRequest(f"dpi must be a number from {MIN_DPI} to {MAX_DPI}")
+    return int(value)
+
+
+def parse_timeline_query(query):
+    """Check the timeline parameters; returns them normalized (equal images, equal parameters)."""
+    theme = query_value(query, "theme", "dark")
+    if theme not in THEMES:
+        raise BadRequest(f"theme must be one of {', '.join(THEMES)}")
+    dates = {}
+    for name in ("since", "until"):
+        value = query_value(query, name)
+        try:
+            dates[name] = value and generate_plots.parse_date_arg(value).date().isoformat()
+        except ValueError:
+            raise BadRequest(f"{name} must be a YYYY-MM-DD date")
+    categories = query_value(query, "categories")
+    if categories:
+        categories = sorted(set(categories.split(",")))
+        unknown = [category for category in categories if category not in generate_plots.CATEGORIES]
+        if unknown:
+            raise BadRequest(f"unknown category {unknown[0]!r} (choose from {', '.join(generate_plots.CATEGORIES)})")
+    return {"theme": theme, "dpi": parse_dpi(query, TIMELINE_DPI), **dates, "categories": categories or None}
+
+
+def select_releases(df, params):
+    """Return the releases in the date window and categories of the parameters."""
+    mask = np.ones(len(df["date"]), dtype=bool)
+    if params["since"]:
+        mask &= df["date"] >= datetime64(generate_plots.parse_date_arg(params["since"]))
+    if params["until"]:
+        mask &= df["date"] < datetime64(generate_plots.parse_date_arg(params["until"]))
+    if params["categories"]:
+        mask &= np.isin(df["category"], params["categories"])
+    return take(df, mask)
+
+
+def etag_matches(header, etag):
+    """Check whether an If-None-Match header lists etag (or is *)."""
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def render_timeline(df, params):
+    """Render the release timeline with the parameters; returns the PNG."""
+    releases = select_releases(df, params)
+    if (releases["category"] == "").all():
+        raise BadRequest("no releases in the date window and categories")
+    model = generate_plots.build_timeline(releases)
+    theme = generate_plots.get_theme_config(THEMES[params["theme"]])
+    generate_plots.apply_theme(model, theme)
+    return png_bytes(model["fig"], params["dpi"], theme["bg_color"])
+
+
+def render_team(module, df, team, params):
+    """Render the team timeline with the parameters; returns the PNG."""
+    fig, _ = module.build_team_figure(df, team)
+    return png_bytes(fig, params["dpi"], module.BACKGROUND_COLOR)
+
+
+class RenderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, releases_file, cache_size):
+        super().__init__(address, RenderHandler)
+        self.releases = Dataset(releases_file, load_releases)
+        self.team = Dataset(Path(team_timeline.__file__), load_team)
+        self.cache = LRUCache(cache_size)
+        self.render_lock = threading.Lock()
+
+    def image(self, key, render):
+        """Return the PNG of the image with key (its ETag) from the cache, rendering it on a miss."""
+        png = self.cache.get(key)
+        if png is not None:
+            return png, "hit"
+        with self.render_lock:
+            png = self.cache.get(key)  # Rendered while waiting for the lock
+            if png is None:
+                png = render()
+                self.cache.put(key, png)
+        return png, "render"
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = "STEELRender/1.0"
+
+    def do_GET(self):
+        start = time.perf_counter()
+        status, source = self.respond()
+        self.log_message('"%s" %s %s in %.2f ms', self.requestline, status, source, (time.perf_counter() - start) * 1000)
+
+    def do_HEAD(self):
+        self.do_GET()  # send_image and send_text leave out the body
+
+    def respond(self):
+        """Answer the request; returns the status and where the answer came from, for the log."""
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path == "/timeline.png":
+                params = parse_timeline_query(query)
+                digest, df = self.server.releases.current()
+                render = lambda: render_timeline(df, params)  # noqa: E731
+            elif url.path == "/team.png":
+                params = {"dpi": parse_dpi(query, team_timeline.OUTPUT_DPI)}
+                digest, (module, df, team) = self.server.team.current()
+                render = lambda: render_team(module, df, team, params)  # noqa: E731
+            else:
+                return self.send_text(404, f"Not found: {url.path} (serving /timeline.png and /team.png)")
+
+            etag = f'"{render_key(url.path, digest, params)[:32]}"'
+            if etag_matches(self.headers.get("If-None-Match", ""), etag):
+                self.send_image(304, etag)
+                return 304, "not modified"
+            png, source = self.server.image(etag, render)
+            self.send_image(200, etag, png)
+            return 200, source
+        except BadRequest as error:
+            return self.send_text(400, str(error))
+        except Exception:
+            traceback.print_exc()
+            return self.send_text(500, "Rendering failed, see the server log")
+
+    def log_request(self, code="-", size="-"):
+        pass  # Logged with the timing when answered (see do_GET)
+
+    def send_image(self, status, etag, png=None):
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")  # Revalidate: the data may change
+        if png is not None:
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(png)))
+        self.end_headers()
+        if png is not None and self.command != "HEAD":
+            self.wfile.write(png)
+
+    def send_text(self, status, message):
+        body = f"{message}\n".encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+        return status, message
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Serve the STEEL timelines rendered on demand")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8050, help="Port to listen on (default: 8050)")
+    parser.add_argument("--cache-size", type=int, default=64, help="Encoded images kept in memory (default: 64)")
+    parser.add_argument("--releases", type=Path, help="Release data to serve (default: release_timeline/build/releases.txt)")
+    args = parser.parse_args()
+
+    releases_file = generate_plots.check_data_file(args.releases)
+    server = RenderServer((args.host, args.port), releases_file, args.cache_size)
+    server.releases.current()  # Load the data before taking requests
+    print(f"Serving http://{args.host}:{server.server_port}/timeline.png and /team.png (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped serving")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,6 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "matplotlib>=3.8.0",
-#     "pandas>=2.1.0", 
 #     "numpy>=1.24.0"
 # ]
 # ///
@@ -12,23 +11,40 @@
 # Standalone script adapted from:
 # https://coderzcolumn.com/tutorials/data-science/timeline-using-matplotlib
 
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import time
+import traceback
+
 import matplotlib
-import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
 from pathlib import Path
 
-
-matplotlib.use("Agg")  # Non-interactive backend for saving files
+# The datasets are a few dozen rows: they are plain NumPy datetime64 arrays
+# (no pandas), and the figure modules are imported when rendering (no
+# pyplot), so an up-to-date run only loads NumPy and matplotlib's core
 
 # Global date range for the visualization
-START_DATE = pd.Timestamp("2021-01-01")
-END_DATE = pd.Timestamp("2025-12-31")
-DISPLAY_END_DATE = pd.Timestamp("2026-01-01")  # For axis display
-CURRENT_DATE = pd.Timestamp("2025-08-16")  # Today's date for visualization
-
-
-def build_dataset() -> pd.DataFrame:
+START_DATE = np.datetime64("2021-01-01")
+END_DATE = np.datetime64("2025-12-31")
+DISPLAY_END_DATE = np.datetime64("2026-01-01")  # For axis display
+CURRENT_DATE = np.datetime64("2025-08-16")  # Today's date for visualization
+YEAR_STARTS = np.arange("2021", "2027", dtype="datetime64[Y]").astype("datetime64[D]")  # Axis ticks
+
+# Output and build cache: the figure is only re-rendered when its inputs (the
+# datasets, this script or matplotlib) change
+BUILD_DIR = Path(__file__).parent / "build"
+OUTPUT_FILE = BUILD_DIR / "team_timeline.png"
+OUTPUT_DPI = 200
+BACKGROUND_COLOR = "#f8f9fa"  # For presentation
+CACHE_FILE = BUILD_DIR / "cache" / "team_timeline.json"
+
+
+def build_dataset() -> tuple[dict, dict]:
+    """Return the team events (Date, Product, Level) and headcounts (Date, Role, Count) as arrays."""
     # Print version as in the tutorial
     print("Matplotlib Version : {}".format(matplotlib.__version__))
 
@@ -42,10 +58,10 @@ def build_dataset() -> pd.DataFrame:
         # "2025-10-01": "THE WELD: Merge EELS and EEST Repos",
     }
 
-    dates = dates_to_team_events.keys()
-    phones = dates_to_team_events.values()
-    iphone_df = pd.DataFrame(data={"Date": dates, "Product": phones})
-    iphone_df["Date"] = pd.to_datetime(iphone_df["Date"])
+    events = {
+        "Date": np.array(list(dates_to_team_events), dtype="datetime64[D]"),
+        "Product": list(dates_to_team_events.values()),
+    }
 
     # Team member count with role breakdown
     date_to_team_roles = {
@@ -77,33 +93,40 @@ def build_dataset() -> pd.DataFrame:
         },  # Projected: intern converts to Grantee
     }
 
-    # Convert to DataFrame for easier plotting
-    team_df = pd.DataFrame(date_to_team_roles).T
-    team_df.index = pd.to_datetime(team_df.index)
-    team_df = team_df.fillna(0).astype(int)
+    # Convert to a (change point x role) count matrix for easier plotting;
+    # roles missing at a change point count 0
+    roles = list(dict.fromkeys(role for counts in date_to_team_roles.values() for role in counts))
+    team = {
+        "Date": np.array(list(date_to_team_roles), dtype="datetime64[D]"),
+        "Role": roles,
+        "Count": np.array([[counts.get(role, 0) for role in roles] for counts in date_to_team_roles.values()]),
+    }
 
     # Generate Level column (alternating +/- ranges) as in the tutorial
     # Seed to make the script reproducible (optional)
     rng = np.random.default_rng(42)
     levels = []
-    for i in range(len(iphone_df)):
+    for i in range(len(events["Date"])):
         if (i % 2) == 0:
             levels.append(rng.integers(-6, -2))  # negative range: -6 .. -3
         else:
             levels.append(rng.integers(2, 6))  # positive range: 2 .. 5
-    iphone_df["Level"] = levels
+    events["Level"] = np.array(levels)
 
-    return iphone_df, team_df
+    return events, team
 
 
-def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
+def build_team_figure(df: dict, team: dict):
+    """Build the timeline and team size figure; returns fig, (ax1, ax2)."""
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import MaxNLocator
+
     # Create figure with 2 subplots NOT sharing x-axis (to allow separate tick control)
-    fig, (ax1, ax2) = plt.subplots(
-        2, 1, figsize=(20, 12), gridspec_kw={"height_ratios": [2, 1]}, sharex=False
-    )
+    fig = Figure(figsize=(20, 12))
+    ax1, ax2 = fig.subplots(2, 1, gridspec_kw={"height_ratios": [2, 1]}, sharex=False)
 
     # Set background color for presentation
-    fig.patch.set_facecolor("#f8f9fa")
+    fig.patch.set_facecolor(BACKGROUND_COLOR)
 
     # SUBPLOT 1: Timeline
     # Dotted horizontal line across full timeline
@@ -116,12 +139,12 @@ def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
         alpha=0.6,
     )
     # Horizontal timeline line with circle markers
-    ax1.plot(df.Date, [0] * len(df), "-o", color="black", markerfacecolor="white")
+    ax1.plot(df["Date"], [0] * len(df["Date"]), "-o", color="black", markerfacecolor="white")
 
     # Set x-axis limits and ticks with year labels
-    ax1.set_xlim(START_DATE - pd.Timedelta(days=30), DISPLAY_END_DATE)
+    ax1.set_xlim(START_DATE - np.timedelta64(30, "D"), DISPLAY_END_DATE)
     ax1.set_ylim(-7, 7)
-    ax1.set_xticks(pd.date_range("2021-1-1", "2026-1-1", freq="YS"))
+    ax1.set_xticks(YEAR_STARTS)
     ax1.set_xticklabels(
         [str(year) for year in range(2021, 2027)],
         fontsize=20,
@@ -131,13 +154,13 @@ def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
     ax1.tick_params(axis="x", labelsize=20, colors="#444", pad=10)
 
     # Add Ethereum upgrade markers
-    # LONDON_DATE = pd.Timestamp("2021-08-05")
+    # LONDON_DATE = np.datetime64("2021-08-05")
     # ax1.axvline(x=LONDON_DATE, color='#e74c3c', linestyle='--', linewidth=2, alpha=0.7, zorder=1)
     # ax1.text(LONDON_DATE, -7.5, 'London', ha='center', fontsize=16,
     #          color='#e74c3c', fontweight='bold', bbox=dict(boxstyle='round,pad=0.3',
     #          facecolor='white', edgecolor='#e74c3c', alpha=0.8))
 
-    MERGE_DATE = pd.Timestamp("2022-09-15")
+    MERGE_DATE = np.datetime64("2022-09-15")
     ax1.axvline(
         x=MERGE_DATE, color="#e74c3c", linestyle="--", linewidth=2, alpha=0.7, zorder=1
     )
@@ -154,19 +177,19 @@ def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
         ),
     )
 
-    # SHAPELLA_DATE = pd.Timestamp("2023-04-12")
+    # SHAPELLA_DATE = np.datetime64("2023-04-12")
     # ax1.axvline(x=SHAPELLA_DATE, color='#e74c3c', linestyle='--', linewidth=2, alpha=0.7, zorder=1)
     # ax1.text(SHAPELLA_DATE, -7.5, 'Shapella', ha='center', fontsize=16,
     #          color='#e74c3c', fontweight='bold', bbox=dict(boxstyle='round,pad=0.3',
     #          facecolor='white', edgecolor='#e74c3c', alpha=0.8))
 
-    # DENCUN_DATE = pd.Timestamp("2024-03-13")
+    # DENCUN_DATE = np.datetime64("2024-03-13")
     # ax1.axvline(x=DENCUN_DATE, color='#e74c3c', linestyle='--', linewidth=2, alpha=0.7, zorder=1)
     # ax1.text(DENCUN_DATE, -7.5, 'Dencun', ha='center', fontsize=16,
     #          color='#e74c3c', fontweight='bold', bbox=dict(boxstyle='round,pad=0.3',
     #          facecolor='white', edgecolor='#e74c3c', alpha=0.8))
 
-    # PECTRA_DATE = pd.Timestamp("2025-03-07")
+    # PECTRA_DATE = np.datetime64("2025-03-07")
     # ax1.axvline(x=PECTRA_DATE, color='#e74c3c', linestyle='--', linewidth=2, alpha=0.7, zorder=1)
     # ax1.text(PECTRA_DATE, -7.5, 'Pectra', ha='center', fontsize=16,
     #          color='#e74c3c', fontweight='bold', bbox=dict(boxstyle='round,pad=0.3',
@@ -195,9 +218,9 @@ def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
     )
 
     # Annotate each release with month-year and product, with a line to Level
-    for idx in range(len(df)):
+    for idx in range(len(df["Date"])):
         dt, product, level = df["Date"][idx], df["Product"][idx], df["Level"][idx]
-        dt_str = dt.strftime("%b %Y")
+        dt_str = dt.item().strftime("%b %Y")
 
         # Different styling for past vs future events
         if dt <= CURRENT_DATE:
@@ -245,48 +268,35 @@ def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
         "Intern": "#9b59b6",  # Purple
     }
 
-    # Create a more continuous dataset by interpolating between points
-    # Split data into actual and projected
-    actual_mask = team_df.index <= CURRENT_DATE
-    projected_mask = team_df.index >= CURRENT_DATE
-
-    # Use step functions (no interpolation) - values stay constant until next change
-    date_range = pd.date_range(
-        start=team_df.index.min(), end=team_df.index.max(), freq="D"
-    )
-    team_df_interpolated = team_df.reindex(date_range).ffill().fillna(0)
-
-    # Split interpolated data
-    actual_data = team_df_interpolated[team_df_interpolated.index <= CURRENT_DATE]
-    projected_data = team_df_interpolated[team_df_interpolated.index >= CURRENT_DATE]
-
-    # Plot actual data (solid)
-    bottom_actual = np.zeros(len(actual_data))
-    for role in team_df.columns:
-        ax2.fill_between(
-            actual_data.index,
-            bottom_actual,
-            bottom_actual + actual_data[role],
-            alpha=0.9,
-            label=role,
-            color=role_colors.get(role, "#95a5a6"),
-            edgecolor="none",
-        )
-        bottom_actual += actual_data[role].values
-
-    # Plot projected data (with pattern/transparency)
-    bottom_proj = np.zeros(len(projected_data))
-    for role in team_df.columns:
-        ax2.fill_between(
-            projected_data.index,
-            bottom_proj,
-            bottom_proj + projected_data[role],
-            alpha=0.4,
-            color=role_colors.get(role, "#95a5a6"),
-            edgecolor="none",
-            hatch="//",
-        )
-        bottom_proj += projected_data[role].values
+    # Stack the roles straight from the change points: each count holds until
+    # the next change (post steps), so the polygons have a few vertices per
+    # change instead of one per day. The stack tops are a cumulative sum over
+    # the roles of each change point.
+    dates = team["Date"]
+    counts = team["Count"].astype(float)
+    tops = np.cumsum(counts, axis=1)
+
+    # Split at today into actual (solid) and projected (with pattern/transparency)
+    segments = [
+        (dates.min(), CURRENT_DATE, dict(alpha=0.9), True),
+        (CURRENT_DATE, dates.max(), dict(alpha=0.4, hatch="//"), False),
+    ]
+    for start, end, style, labelled in segments:
+        # The segment's change points, each with the counts in effect from it
+        inside = dates[(dates > start) & (dates < end)]
+        edges = np.concatenate([[start], inside, [end]]).astype(dates.dtype)
+        in_effect = np.searchsorted(dates, edges, side="right") - 1
+        for i, role in enumerate(team["Role"]):
+            ax2.fill_between(
+                edges,
+                tops[in_effect, i] - counts[in_effect, i],
+                tops[in_effect, i],
+                step="post",
+                label=role if labelled else None,
+                color=role_colors.get(role, "#95a5a6"),
+                edgecolor="none",
+                **style,
+            )
 
     # Add Ethereum upgrade lines
     # ax2.axvline(x=LONDON_DATE, color='#e74c3c', linestyle='--', linewidth=2, alpha=0.7)
@@ -299,7 +309,7 @@ def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
     ax2.axvline(x=CURRENT_DATE, color="#e74c3c", linestyle="--", linewidth=2, alpha=0.7)
 
     # Configure histogram subplot - remove frame and improve aesthetics
-    ax2.set_ylim(0, team_df.sum(axis=1).max() * 1.25)
+    ax2.set_ylim(0, team["Count"].sum(axis=1).max() * 1.25)
 
     # Remove all spines (frame)
     for spine in ax2.spines.values():
@@ -311,8 +321,8 @@ def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
     ax2.set_facecolor("#f8f9fa")
 
     # Format x-axis to match timeline
-    ax2.set_xlim(START_DATE - pd.Timedelta(days=30), DISPLAY_END_DATE)
-    ax2.set_xticks(pd.date_range("2021-1-1", "2026-1-1", freq="YS"))
+    ax2.set_xlim(START_DATE - np.timedelta64(30, "D"), DISPLAY_END_DATE)
+    ax2.set_xticks(YEAR_STARTS)
     ax2.set_xticklabels(range(2021, 2027), fontsize=20, color="#444")
 
     # Move y-axis to the right side
@@ -321,7 +331,7 @@ def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
 
     # Format y-axis labels - integers only
     ax2.tick_params(axis="y", labelsize=16, colors="#444")
-    ax2.yaxis.set_major_locator(plt.MaxNLocator(integer=True))
+    ax2.yaxis.set_major_locator(MaxNLocator(integer=True))
 
     # Remove tick marks
     ax2.tick_params(bottom=False, left=False, right=False)
@@ -343,41 +353,53 @@ def plot_horizontal_basic(df: pd.DataFrame, team_df: pd.DataFrame):
     # Overall figure title - removed for presentation
     # fig.suptitle("STEEL Team Evolution", fontsize=20, fontweight="bold", y=0.98)
 
-    plt.tight_layout()
+    fig.tight_layout()
+
+    return fig, (ax1, ax2)
+
+
+def plot_horizontal_basic(df: dict, team: dict):
+    fig, (ax1, ax2) = build_team_figure(df, team)
 
     # Create build directory if it doesn't exist
-    script_dir = Path(__file__).parent
-    build_dir = script_dir / "build"
-    build_dir.mkdir(exist_ok=True)
-
-    # Save the figure with high quality for presentation
-    filename = build_dir / "team_timeline.png"
-    plt.savefig(
-        filename,
-        dpi=200,
+    BUILD_DIR.mkdir(exist_ok=True)
+
+    # Save the figure with high quality for presentation, atomically (to a
+    # temporary file renamed into place); the PNG metadata has no timestamp
+    filename = OUTPUT_FILE
+    tmp_file = filename.with_name(f".{filename.name}.{os.getpid()}.tmp")
+    fig.savefig(
+        tmp_file,
+        format="png",
+        dpi=OUTPUT_DPI,
         bbox_inches="tight",
-        facecolor="#f8f9fa",
+        facecolor=BACKGROUND_COLOR,
         edgecolor="none",
     )
+    tmp_file.replace(filename)
     print(f"Figure saved as '{filename}'")
 
     return fig, (ax1, ax2)
 
 
-def plot_horizontal_fivethirtyeight(df: pd.DataFrame):
-    with plt.style.context("fivethirtyeight"):
-        fig, ax = plt.subplots(figsize=(18, 9))
+def plot_horizontal_fivethirtyeight(df: dict):
+    from matplotlib.figure import Figure
+    from matplotlib.style import context
+
+    with context("fivethirtyeight"):
+        fig = Figure(figsize=(18, 9))
+        ax = fig.subplots()
 
-        ax.plot(df.Date, [0] * len(df), "-o", color="black", markerfacecolor="white")
+        ax.plot(df["Date"], [0] * len(df["Date"]), "-o", color="black", markerfacecolor="white")
         ax.set_xticks(
-            pd.date_range("2023-1-1", "2025-8-1", freq="ys"), range(2023, 2026)
+            np.arange("2023", "2026", dtype="datetime64[Y]").astype("datetime64[D]"), range(2023, 2026)
         )
         # ax.set_xticks(pd.date_range("2007-1-1", "2023-1-1", freq="ys"), range(2007, 2024))
         ax.set_ylim(-7, 7)
 
-        for idx in range(len(df)):
+        for idx in range(len(df["Date"])):
             dt, product, level = df["Date"][idx], df["Product"][idx], df["Level"][idx]
-            dt_str = dt.strftime("%b-%Y")
+            dt_str = dt.item().strftime("%b-%Y")
             ax.annotate(
                 dt_str + "\n" + product,
                 xy=(dt, 0.1 if level > 0 else -0.1),
@@ -427,11 +449,51 @@ def plot_horizontal_fivethirtyeight(df: pd.DataFrame):
 #         return fig, ax
 
 
-def main():
-    df, team_df = build_dataset()
+def file_sha256(path):
+    """Hash a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def input_digest(df: dict, team: dict) -> str:
+    """Hash everything the figure depends on: the datasets, this script and matplotlib's version."""
+    digest = hashlib.sha256(matplotlib.__version__.encode())
+    digest.update(Path(__file__).read_bytes())
+    for dataset in (df, team):
+        for name, values in dataset.items():
+            digest.update(repr((name, np.asarray(values).tolist())).encode())
+    return digest.hexdigest()
+
+
+def is_up_to_date(key: str) -> bool:
+    """Check whether the figure was rendered from inputs with this digest and is unchanged since."""
+    try:
+        cached = json.loads(CACHE_FILE.read_text())
+        return cached["key"] == key and file_sha256(OUTPUT_FILE) == cached["sha256"]
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def record_render(key: str):
+    """Atomically record the input digest and content hash of the rendered figure."""
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(json.dumps({"key": key, "sha256": file_sha256(OUTPUT_FILE)}, indent=2) + "\n")
+    tmp_file.replace(CACHE_FILE)
+
+
+def render():
+    df, team = build_dataset()
+
+    # Skip rendering entirely if nothing the figure depends on changed
+    key = input_digest(df, team)
+    if is_up_to_date(key):
+        print(f"Figure up to date: '{OUTPUT_FILE}'")
+        return
 
     # 1) Basic horizontal with team member histogram
-    plot_horizontal_basic(df, team_df)
+    plot_horizontal_basic(df, team)
+    record_render(key)
 
     # 2) Horizontal with fivethirtyeight style
     # plot_horizontal_fivethirtyeight(df)
@@ -439,8 +501,46 @@ def main():
     # 3) Vertical timeline
     # plot_vertical_fivethirtyeight(df)
 
-    # plt.show()  # Commented out for non-interactive mode
-    plt.close()  # Close the figure to free memory
+    # fig.show()  # Commented out for non-interactive mode
+
+
+def watch(interval: float = 0.2):
+    """Re-render whenever this script (e.g. the datasets in build_dataset) changes.
+
+    The process stays alive with matplotlib and numpy imported; the
+    edited script is reloaded with importlib.reload and rendered again.
+    """
+    script = Path(__file__)
+    module = importlib.import_module(script.stem)  # __main__ cannot be reloaded
+    seen = script.stat().st_mtime_ns
+    print(f"Watching {script.name} for changes (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(interval)
+            mtime = script.stat().st_mtime_ns
+            if mtime == seen:
+                continue
+            seen = mtime
+            start = time.perf_counter()
+            try:
+                module = importlib.reload(module)
+                module.render()
+            except Exception:
+                traceback.print_exc()  # Keep watching: the next edit may fix it
+            print(f"Re-rendered in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the STEEL team timeline")
+    parser.add_argument(
+        "--watch", action="store_true", help="Keep running and re-render whenever this script changes"
+    )
+    args = parser.parse_args()
+    render()
+    if args.watch:
+        watch()
 
 
 if __name__ == "__main__":